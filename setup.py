@@ -20,7 +20,7 @@ install_requires = (
 
 class DjangoTest(TestCommand):
     DIRNAME = os.path.dirname(__file__)
-    APPS = ('tests',)
+    APPS = ('django_richenum', 'tests',)
 
     def finalize_options(self):
         TestCommand.finalize_options(self)
@@ -1,29 +1,63 @@
+import copy
+import hashlib
+
 from django import forms
 from django.contrib import admin
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count
 from django.utils.encoding import smart_str
 from django.utils.translation import gettext_lazy as _
 
 from ..forms.fields import IndexEnumField as IndexEnumFormField
 from ..forms.fields import CanonicalEnumField as CanonicalNameEnumFormField
+from ..lookup_tables import get_lookup_table
 
 from richenum import RichEnum, OrderedRichEnum
 
 
+_FORM_CLASSES = {}
+
+
+def get_filter_form_class(enum, field_path):
+    """
+    Returns a (cached) Django form class that validates the filter's request param
+    """
+    try:
+        return _FORM_CLASSES[(enum, field_path)]
+    except KeyError:
+        pass
+
+    form_cls_name = "%sRichEnumFieldListFilterForm" % enum.__name__
+    form_attrs = {}
+    if issubclass(enum, OrderedRichEnum):
+        form_attrs[field_path] = IndexEnumFormField(enum)
+    elif issubclass(enum, RichEnum):
+        form_attrs[field_path] = CanonicalNameEnumFormField(enum)
+
+    form_cls = _FORM_CLASSES[(enum, field_path)] = type(form_cls_name, (forms.Form, ), form_attrs)
+    return form_cls
+
+
 class RichEnumFieldListFilter(admin.FieldListFilter):
+    # Show the number of matching rows next to each choice, computed with a
+    # single GROUP BY on the changelist queryset.
+    show_counts = False
+    # Hide choices without any matching rows (implies show_counts).
+    hide_empty = False
+    # Cache the counts for this many seconds (None disables caching).
+    counts_cache_timeout = None
+    counts_cache_alias = 'default'
+
     def __init__(self, field, request, params, model, model_admin, field_path):
         self.enum = field.enum
         self.lookup_kwarg = field_path
-        self.lookup_val = request.GET.get(self.lookup_kwarg)
-
-        # Create a Django form to validate request params
-        form_cls_name = "%sRichEnumFieldListFilterForm" % self.enum.__name__
-        form_attrs = {}
-        if issubclass(self.enum, OrderedRichEnum):
-            form_attrs[self.lookup_kwarg] = IndexEnumFormField(self.enum)
-        elif issubclass(self.enum, RichEnum):
-            form_attrs[self.lookup_kwarg] = CanonicalNameEnumFormField(self.enum)
+        self.lookup_val = params.get(self.lookup_kwarg)
+        # Kept to rebuild the changelist queryset without this filter (see
+        # get_counts_queryset).
+        self.request = request
 
-        self.form_cls = type(form_cls_name, (forms.Form, ), form_attrs)
+        self.form_cls = get_filter_form_class(self.enum, self.lookup_kwarg)
 
         super(RichEnumFieldListFilter, self).__init__(field, request, params, model, model_admin, field_path)
 
@@ -45,20 +79,180 @@ class RichEnumFieldListFilter(admin.FieldListFilter):
         elif issubclass(self.enum, RichEnum):
             choices = self.enum.choices()
 
+        counts = None
+        if self.show_counts or self.hide_empty:
+            counts = self.get_counts(cl)
+
         for lookup, title in choices:
+            selected = smart_str(lookup) == self.lookup_val
+            if counts is not None:
+                count = counts.get(lookup, 0)
+                if self.hide_empty and not count and not selected:
+                    continue
+                title = "%s (%d)" % (title, count)
             yield {
-                "selected": smart_str(lookup) == self.lookup_val,
+                "selected": selected,
                 "query_string": cl.get_query_string({
                     self.lookup_kwarg: lookup}),
                 "display": title,
             }
 
+    def get_counts_queryset(self, cl):
+        """
+        Returns the changelist queryset with every filter (and search) applied
+        except this one, so that the counts tell how many rows each choice
+        would match rather than being zero for everything not selected.
+        """
+        params = dict((key, value) for key, value in cl.params.items() if key not in self.expected_parameters())
+        if len(params) == len(cl.params):
+            return cl.queryset
+
+        # Rebuild the queryset the same way the changelist does, from a copy
+        # that doesn't have this filter's parameters.
+        counts_cl = copy.copy(cl)
+        counts_cl.params = params
+        return counts_cl.get_queryset(self.request)
+
+    def get_counts(self, cl):
+        """
+        Returns a dict of {lookup value: number of rows} in the changelist
+        queryset, filtered by everything but this filter.
+        """
+        queryset = self.get_counts_queryset(cl).order_by().values_list(self.lookup_kwarg).annotate(
+            _enum_count=Count("*"))
+
+        cache = cache_key = None
+        if self.counts_cache_timeout is not None:
+            try:
+                sql, params = queryset.query.sql_with_params()
+            except EmptyResultSet:
+                return {}
+            cache = caches[self.counts_cache_alias]
+            cache_key = "django_richenum.filter_counts.%s" % hashlib.md5(
+                smart_str((queryset.db, sql, params)).encode("utf-8")).hexdigest()
+            counts = cache.get(cache_key)
+            if counts is not None:
+                return counts
+
+        counts = {}
+        for value, count in queryset:
+            if value is not None:
+                # Lazy fields load the stored value rather than the enum value.
+                value = self.field.to_python(value)
+                counts[value.index if issubclass(self.enum, OrderedRichEnum) else value.canonical_name] = count
+
+        if cache is not None:
+            cache.set(cache_key, counts, self.counts_cache_timeout)
+        return counts
+
+    def get_lookup_value(self):
+        """
+        Returns the enum value selected in the request, or None if there's no
+        (valid) selection. Equivalent to validating the request with form_cls,
+        but only costs a dict lookup.
+        """
+        if self.lookup_val is None:
+            return None
+
+        table = get_lookup_table(self.enum)
+        if issubclass(self.enum, OrderedRichEnum):
+            try:
+                return table.by_index.get(int(self.lookup_val))
+            except ValueError:
+                return None
+        return table.by_canonical.get(self.lookup_val)
+
     def queryset(self, request, queryset):
         kwargs = {}
 
-        # Validate filter params
-        form = self.form_cls(request.GET)
-        if form.is_valid():
-            kwargs[self.lookup_kwarg] = form.cleaned_data[self.lookup_kwarg]
+        value = self.get_lookup_value()
+        if value is not None:
+            kwargs[self.lookup_kwarg] = value
+
+        return queryset.filter(**kwargs)
+
+
+class RichEnumFieldMultipleListFilter(RichEnumFieldListFilter):
+    """
+    Filters by several enum values at once, with a single __in query (or by
+    excluding them).
+
+    The selection is encoded in the query string as a hex bitmask: bit N
+    stands for the OrderedRichEnum member with index N, or for the Nth member
+    of a RichEnum.
+    """
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.mask_kwarg = "%s__enum_mask" % field_path
+        self.exclude_kwarg = "%s__enum_exclude" % field_path
+        try:
+            self.mask = max(int(params.get(self.mask_kwarg, "0"), 16), 0)
+        except ValueError:
+            self.mask = 0
+        self.exclude = params.get(self.exclude_kwarg) == "1"
+
+        super(RichEnumFieldMultipleListFilter, self).__init__(field, request, params, model, model_admin, field_path)
+
+        ordered = issubclass(self.enum, OrderedRichEnum)
+        self.member_bits = [
+            (member, member.index if ordered else position)
+            for position, member in enumerate(self.enum.members())
+        ]
+
+    def expected_parameters(self):
+        return [self.mask_kwarg, self.exclude_kwarg]
+
+    def get_selected_members(self):
+        return [member for member, bit in self.member_bits if self.mask >> bit & 1]
+
+    def choices(self, cl):
+        yield {
+            "selected": not self.mask,
+            "query_string": cl.get_query_string({}, [self.mask_kwarg, self.exclude_kwarg]),
+            "display": _("All"),
+        }
+
+        counts = None
+        if self.show_counts or self.hide_empty:
+            counts = self.get_counts(cl)
+
+        ordered = issubclass(self.enum, OrderedRichEnum)
+        for member, bit in self.member_bits:
+            selected = bool(self.mask >> bit & 1)
+            title = member.display_name
+            if counts is not None:
+                count = counts.get(member.index if ordered else member.canonical_name, 0)
+                if self.hide_empty and not count and not selected:
+                    continue
+                title = "%s (%d)" % (title, count)
+
+            # Clicking a choice toggles it in the selection
+            mask = self.mask ^ (1 << bit)
+            if mask:
+                query_string = cl.get_query_string({self.mask_kwarg: "%x" % mask})
+            else:
+                query_string = cl.get_query_string({}, [self.mask_kwarg])
+            yield {
+                "selected": selected,
+                "query_string": query_string,
+                "display": title,
+            }
+
+        if self.exclude:
+            query_string = cl.get_query_string({}, [self.exclude_kwarg])
+        else:
+            query_string = cl.get_query_string({self.exclude_kwarg: "1"})
+        yield {
+            "selected": self.exclude,
+            "query_string": query_string,
+            "display": _("Exclude selected"),
+        }
+
+    def queryset(self, request, queryset):
+        members = self.get_selected_members()
+        if not members:
+            return queryset
 
+        kwargs = {"%s__in" % self.lookup_kwarg: members}
+        if self.exclude:
+            return queryset.exclude(**kwargs)
         return queryset.filter(**kwargs)
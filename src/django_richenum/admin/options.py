@@ -1,20 +1,78 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import FieldDoesNotExist
+from django.urls import path
 
+from ..models.expressions import EnumDisplay
+from ..models.expressions import EnumOrder
 from ..models.fields import CanonicalNameEnumField
+from ..models.fields import ENUM_FIELD_CLASSES
+from ..models.fields import EnumSetField
 from ..models.fields import IndexEnumField
 from ..models.fields import LaxIndexEnumField
+from ..models.fields import MultipleCanonicalNameEnumField
+from ..models.fields import SmallIndexEnumField
+from .views import EnumAutocompleteJsonView
+from .widgets import EnumAutocompleteSelect
 
 RICH_ENUM_FORMFIELD_FOR_DBFIELD_DEFAULTS = {
     IndexEnumField: {},
     LaxIndexEnumField: {},
+    SmallIndexEnumField: {},
     CanonicalNameEnumField: {},
+    EnumSetField: {},
+    MultipleCanonicalNameEnumField: {},
 }
 
+ENUM_ORDERING_EXPRESSIONS = {
+    'display': EnumDisplay,
+    'order': EnumOrder,
+}
+
+
+class RichEnumChangeList(ChangeList):
+    def get_ordering_field(self, field_name):
+        order_field = super(RichEnumChangeList, self).get_ordering_field(field_name)
+
+        # Sort enum columns by display name/enum order (in SQL) rather than by the stored value
+        expression_cls = ENUM_ORDERING_EXPRESSIONS.get(self.model_admin.enum_ordering)
+        if expression_cls is None or not isinstance(order_field, str):
+            return order_field
+        try:
+            field = self.lookup_opts.get_field(order_field)
+        except FieldDoesNotExist:
+            return order_field
+        if isinstance(field, ENUM_FIELD_CLASSES):
+            return expression_cls(order_field)
+        return order_field
+
 
 class RichEnumModelAdmin(admin.ModelAdmin):
+    # How clicking the header of an enum column sorts the changelist:
+    # None (by stored value), 'display' (by display name) or 'order' (by enum order).
+    enum_ordering = None
+    # Enum fields to edit with an autocomplete (searched over AJAX) rather
+    # than a select listing every member, like autocomplete_fields.
+    enum_autocomplete_fields = ()
+
     def __init__(self, *args, **kwargs):
         super(RichEnumModelAdmin, self).__init__(*args, **kwargs)
 
         # Update unspecified internal formfields
         for model_field_cls, formfield_override_value in RICH_ENUM_FORMFIELD_FOR_DBFIELD_DEFAULTS.items():
             self.formfield_overrides.setdefault(model_field_cls, formfield_override_value)
+
+    def get_changelist(self, request, **kwargs):
+        return RichEnumChangeList
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        view = EnumAutocompleteJsonView.as_view(model_admin=self)
+        return [
+            path('enum-autocomplete/', self.admin_site.admin_view(view), name='%s_%s_enum_autocomplete' % info),
+        ] + super(RichEnumModelAdmin, self).get_urls()
+
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        if db_field.name in self.enum_autocomplete_fields:
+            kwargs['widget'] = EnumAutocompleteSelect(db_field, self.admin_site, using=kwargs.get('using'))
+        return super(RichEnumModelAdmin, self).formfield_for_dbfield(db_field, request, **kwargs)
@@ -0,0 +1,40 @@
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.views.generic import View
+
+from ..lookup_tables import get_lookup_table
+from ..models.fields import IndexEnumField
+
+
+class EnumAutocompleteJsonView(View):
+    '''Searches the members of an enum field listed in the model admin's
+    enum_autocomplete_fields, in the format select2 (and so the admin's
+    autocomplete.js) expects.
+    '''
+    paginate_by = 20
+    model_admin = None
+
+    def get(self, request, *args, **kwargs):
+        field_name = request.GET.get('field_name')
+        if field_name not in self.model_admin.enum_autocomplete_fields:
+            raise PermissionDenied
+        if not self.model_admin.has_view_or_change_permission(request):
+            raise PermissionDenied
+
+        field = self.model_admin.model._meta.get_field(field_name)
+        value_field = 'index' if isinstance(field, IndexEnumField) else 'canonical_name'
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+
+        members = get_lookup_table(field.enum).search(request.GET.get('term', ''))
+        start = (page - 1) * self.paginate_by
+        stop = start + self.paginate_by
+        return JsonResponse({
+            'results': [
+                {'id': str(getattr(member, value_field)), 'text': str(member.display_name)}
+                for member in members[start:stop]
+            ],
+            'pagination': {'more': len(members) > stop},
+        })
@@ -0,0 +1,52 @@
+from django import forms
+from django.contrib.admin.widgets import AutocompleteMixin
+from django.urls import reverse
+from richenum import RichEnumValue
+
+from ..lookup_tables import get_lookup_table
+from ..models.fields import IndexEnumField
+
+
+class EnumAutocompleteSelect(AutocompleteMixin, forms.Select):
+    '''Select for an enum model field that searches its members over AJAX
+    (using the admin's select2 autocomplete), instead of listing every
+    member in the page.
+
+    Only the selected member is rendered as an option. Results come from the
+    model admin's enum autocomplete view; see
+    RichEnumModelAdmin.enum_autocomplete_fields.
+    '''
+    url_name = '%s:%s_%s_enum_autocomplete'
+
+    def get_url(self):
+        opts = self.field.model._meta
+        return reverse(self.url_name % (self.admin_site.name, opts.app_label, opts.model_name))
+
+    def format_value(self, value):
+        # Enum values are submitted as their stored form.
+        value_field = 'index' if isinstance(self.field, IndexEnumField) else 'canonical_name'
+        if not isinstance(value, (tuple, list)):
+            value = [value]
+        value = [getattr(v, value_field) if isinstance(v, RichEnumValue) else v for v in value]
+        return super(EnumAutocompleteSelect, self).format_value(value)
+
+    def optgroups(self, name, value, attr=None):
+        default = (None, [], 0)
+        groups = [default]
+        if not self.is_required and not self.allow_multiple_selected:
+            default[1].append(self.create_option(name, '', '', False, 0))
+
+        table = get_lookup_table(self.field.enum)
+        if isinstance(self.field, IndexEnumField):
+            members = table.by_index_string
+        else:
+            members = table.by_canonical
+        for option_value in value:
+            member = members.get(option_value)
+            if member is None:
+                continue
+            index = len(default[1])
+            default[1].append(self.create_option(name, option_value, str(member.display_name), True, index))
+            if not self.allow_multiple_selected:
+                break
+        return groups
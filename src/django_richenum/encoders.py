@@ -0,0 +1,25 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from richenum import RichEnumValue
+
+
+class RichEnumJSONEncoder(DjangoJSONEncoder):
+    '''JSONEncoder that also handles enum values (and sets of them, as from
+    EnumSetField), encoding them as their canonical names.
+
+    Subclass and set enum_format to 'index' or 'display_name' to encode them
+    differently.
+
+        >>> json.dumps({'my_enum': MyRichEnum.FOO}, cls=RichEnumJSONEncoder)
+        '{"my_enum": "foo"}'
+    '''
+    enum_format = 'canonical_name'
+
+    def default(self, o):
+        if isinstance(o, RichEnumValue):
+            value = getattr(o, self.enum_format)
+            if self.enum_format == 'display_name':
+                return str(value)
+            return value
+        elif isinstance(o, (set, frozenset)) and all(isinstance(value, RichEnumValue) for value in o):
+            return [self.default(value) for value in sorted(o)]
+        return super(RichEnumJSONEncoder, self).default(o)
@@ -2,6 +2,8 @@ from .fields import CanonicalEnumField  # noqa
 from .fields import IndexEnumField  # noqa
 from .fields import MultipleCanonicalEnumField  # noqa
 from .fields import MultipleIndexEnumField  # noqa
+from .widgets import EnumSelect  # noqa
+from .widgets import EnumSelectMultiple  # noqa
 
 
 __all__ = (
@@ -9,4 +11,6 @@ __all__ = (
     'IndexEnumField',
     'MultipleCanonicalEnumField',
     'MultipleIndexEnumField',
+    'EnumSelect',
+    'EnumSelectMultiple',
 )
@@ -5,6 +5,11 @@ from django import forms
 from django.core.exceptions import ValidationError
 from richenum import EnumLookupError
 from richenum import OrderedRichEnumValue
+from richenum import RichEnumValue
+
+from ..lookup_tables import get_lookup_table
+from .widgets import EnumSelect
+from .widgets import EnumSelectMultiple
 
 try:
     from django.forms.fields import RenameFieldMethods  # pylint: disable=no-name-in-module
@@ -33,9 +38,27 @@ class _BaseEnumField(object):
         if 'coerce' in kwargs:
             raise ValueError('Cannot explicitly supply coercion function to enum fields.')
 
-        kwargs['choices'] = self.get_choices()
+        choices = self.get_choices()
+        kwargs['choices'] = choices
         kwargs['coerce'] = self.coerce_value
         super(_BaseEnumField, self).__init__(*args, **kwargs)
+        # Django copies choices into a new list; keep the shared tuple instead.
+        self._set_shared_choices(choices)
+
+    def _set_shared_choices(self, choices):
+        self._choices = self.widget.choices = choices  # pylint: disable=no-member
+
+    def __deepcopy__(self, memo):
+        # Forms deep copy their fields on every instantiation; share the
+        # (immutable) choices rather than copying them.
+        result = super(_BaseEnumField, self).__deepcopy__(memo)  # pylint: disable=no-member
+        result._set_shared_choices(self._choices)
+        return result
+
+    def has_changed(self, initial, data):
+        # Multiple choice fields compare str() of the initial values with the
+        # submitted ones, so compare their form values rather than display names.
+        return super(_BaseEnumField, self).has_changed(self.prepare_value(initial), data)  # pylint: disable=no-member
 
     @abstractmethod
     def get_choices(self):
@@ -54,8 +77,25 @@ class _BaseEnumField(object):
         # do.
         pass
 
+    def validate(self, value):
+        # Membership is checked when the value is coerced, with a single table
+        # lookup per value (see coerce_value), so only check for missing
+        # values here.
+        forms.Field.validate(self, value)
+
     def valid_value(self, value):
-        return value in self.enum
+        try:
+            self.coerce_value(value)
+        except ValidationError:
+            return False
+        return True
+
+    def invalid_choice(self, value):
+        return ValidationError(
+            self.error_messages['invalid_choice'],  # pylint: disable=no-member
+            code='invalid_choice',
+            params={'value': value},
+        )
 
 
 class _BaseCanonicalField(_BaseEnumField):
@@ -64,19 +104,25 @@ class _BaseCanonicalField(_BaseEnumField):
     """
 
     def get_choices(self):
-        return self.enum.choices()
+        return get_lookup_table(self.enum).choices()
 
     def coerce_value(self, name):
+        table = get_lookup_table(self.enum)
         try:
-            return self.enum.from_canonical(name)
-        except EnumLookupError as e:
-            raise ValidationError(str(e))
+            return table.by_canonical[name]
+        except (KeyError, TypeError):
+            pass
+        if isinstance(name, RichEnumValue) and table.by_canonical.get(name.canonical_name) == name:
+            return name
+        raise self.invalid_choice(name)
 
-    # In Django 1.6, value is coerced already. Below 1.6, we need to manually coerce
-    def valid_value(self, value):
-        if isinstance(value, str):
-            value = self.coerce_value(value)
-        return super(_BaseCanonicalField, self).valid_value(value)
+    def prepare_value(self, value):
+        if isinstance(value, RichEnumValue):
+            return value.canonical_name
+        # e.g. the tuples of a MultipleCanonicalNameEnumField
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return [self.prepare_value(v) for v in value]
+        return super(_BaseCanonicalField, self).prepare_value(value)
 
 
 class _BaseIndexField(_BaseEnumField):
@@ -85,47 +131,50 @@ class _BaseIndexField(_BaseEnumField):
     """
 
     def get_choices(self):
-        return self.enum.choices(value_field='index')
+        return get_lookup_table(self.enum).choices(value_field='index')
 
     def coerce_value(self, index):
+        table = get_lookup_table(self.enum)
+        # Submitted values are strings.
         try:
-            return self.enum.from_index(int(index))
-        except EnumLookupError as e:
-            raise ValidationError(str(e))
-
-    # In Django 1.6, value is coerced already. Below 1.6, we need to manually coerce
-    def valid_value(self, value):
-        # In < Dango 1.6, this comes in as a string, so we should flip it to be an int
-        if isinstance(value, str):
-            try:
-                value = int(value)
-            except ValueError as e:
-                raise ValidationError(str(e))
-
-        if isinstance(value, int):
-            value = self.coerce_value(value)
-
-        return super(_BaseIndexField, self).valid_value(value)
+            return table.by_index_string[index]
+        except (KeyError, TypeError):
+            pass
+        if isinstance(index, OrderedRichEnumValue):
+            if table.by_index.get(index.index) == index:
+                return index
+            raise self.invalid_choice(index)
+        try:
+            return table.from_index(int(index))
+        except (EnumLookupError, TypeError, ValueError):
+            raise self.invalid_choice(index)
 
     def prepare_value(self, value):
         if isinstance(value, OrderedRichEnumValue):
             return value.index
+        # e.g. the frozensets of an EnumSetField
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return [self.prepare_value(v) for v in value]
         return super(_BaseIndexField, self).prepare_value(value)
 
 
 class CanonicalEnumField(_BaseCanonicalField, forms.TypedChoiceField):
-    pass
+    widget = EnumSelect
 
 
 class IndexEnumField(_BaseIndexField, forms.TypedChoiceField):
-    pass
+    widget = EnumSelect
 
 
 class MultipleCanonicalEnumField(_BaseCanonicalField, forms.TypedMultipleChoiceField):
+    widget = EnumSelectMultiple
+
     def _empty_value_factory(self):
         return []
 
 
 class MultipleIndexEnumField(_BaseIndexField, forms.TypedMultipleChoiceField):
+    widget = EnumSelectMultiple
+
     def _empty_value_factory(self):
         return []
@@ -0,0 +1,85 @@
+from django import forms
+from django.forms.renderers import get_default_renderer
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+_RENDERED_OPTIONS = {}
+
+
+class EnumSelect(forms.Select):
+    '''Select that renders the options of an enum's (shared, immutable)
+    choices once per language, and reuses that markup on later renders, only
+    rendering the selected options again.
+
+    Renders like Select otherwise, through the select template; choices that
+    aren't a tuple (e.g. lists set by hand) or that contain groups are
+    rendered by Select every time.
+    '''
+    _options_prerendered = False
+
+    def _render_option(self, value, label, selected, index, renderer):
+        option = self.create_option('', value, label, selected, index)
+        return self._render(option['template_name'], {'widget': option}, renderer)
+
+    def _rendered_options(self, renderer):
+        # [(str(value), unselected option HTML)] for each choice, or None if
+        # the choices can't be cached.
+        choices = self.choices
+        if not isinstance(choices, tuple):
+            return None
+
+        # Subclasses may render options differently (e.g. via create_option),
+        # so they don't share markup.
+        key = (type(self), id(choices), get_language(), self.option_template_name, type(renderer))
+        cached = _RENDERED_OPTIONS.get(key)
+        if cached is None or cached[0] is not choices:
+            if any(isinstance(label, (list, tuple)) for _, label in choices):
+                rendered = None
+            else:
+                rendered = [
+                    ('' if value is None else str(value), self._render_option(value, label, False, index, renderer))
+                    for index, (value, label) in enumerate(choices)
+                ]
+            # Keep a reference to the choices, so their id isn't reused.
+            cached = _RENDERED_OPTIONS[key] = (choices, rendered)
+        return cached[1]
+
+    def optgroups(self, name, value, attrs=None):
+        if self._options_prerendered:
+            # render() adds the cached options to the rendered select.
+            return []
+        return super(EnumSelect, self).optgroups(name, value, attrs)
+
+    def render(self, name, value, attrs=None, renderer=None):
+        if renderer is None:
+            renderer = get_default_renderer()
+        options = self._rendered_options(renderer)
+        if options is None:
+            return super(EnumSelect, self).render(name, value, attrs, renderer)
+
+        # Render the select template as usual (so get_context, template_name
+        # and overridden templates all apply), but without any options.
+        self._options_prerendered = True
+        try:
+            context = self.get_context(name, value, attrs)
+        finally:
+            self._options_prerendered = False
+        html = self._render(self.template_name, context, renderer)
+        head, end_tag, tail = html.rpartition('</select>')
+        if not end_tag:
+            return super(EnumSelect, self).render(name, value, attrs, renderer)
+
+        selected = set(context['widget']['value'])
+        has_selected = False
+        rendered = []
+        for index, (option_value, option_html) in enumerate(options):
+            if option_value in selected and (not has_selected or self.allow_multiple_selected):
+                has_selected = True
+                option_html = self._render_option(*self.choices[index], True, index, renderer)
+            rendered.append('  %s\n' % option_html)
+
+        return mark_safe(head + ''.join(rendered) + end_tag + tail)
+
+
+class EnumSelectMultiple(EnumSelect, forms.SelectMultiple):
+    pass
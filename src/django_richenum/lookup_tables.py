@@ -0,0 +1,135 @@
+'''Precomputed lookup tables for converting stored values to enum members.
+
+richenum's ``from_index`` and ``from_canonical`` scan every member of the
+enum on each call. The tables here are built once per enum and turn those
+conversions into a single dict lookup.
+
+Enums are not expected to change at runtime; tests that patch an enum's
+members should call ``clear_lookup_tables`` afterwards.
+'''
+from bisect import bisect_left
+
+from django.utils.translation import get_language
+
+
+_LOOKUP_TABLES = {}
+
+
+class PrefixIndex(object):
+    '''Finds the members of an enum whose canonical name, display name or any
+    word of the display name starts with a (case-insensitive) term.
+
+    '''
+    def __init__(self, members):
+        self.members = members
+        entries = set()
+        for position, member in enumerate(members):
+            display_name = str(member.display_name).lower()
+            keys = set([str(member.canonical_name).lower(), display_name] + display_name.split())
+            entries.update((key, position) for key in keys)
+        entries = sorted(entries)
+        self.keys = [key for key, _ in entries]
+        self.positions = [position for _, position in entries]
+
+    def search(self, term):
+        '''Return the matching members, in enum order.'''
+        term = term.strip().lower()
+        if not term:
+            return list(self.members)
+        positions = set()
+        i = bisect_left(self.keys, term)
+        while i < len(self.keys) and self.keys[i].startswith(term):
+            positions.add(self.positions[i])
+            i += 1
+        return [self.members[position] for position in sorted(positions)]
+
+
+class LookupTable(object):
+    '''Maps the stored representations of an enum's members back to the members.
+
+    '''
+    def __init__(self, enum):
+        self.enum = enum
+        self.members = tuple(enum.members())
+
+        # richenum returns the first matching member, so keep the first one
+        # seen for any duplicated key.
+        self.by_canonical = {}
+        for member in self.members:
+            self.by_canonical.setdefault(member.canonical_name, member)
+
+        self.by_index = None
+        self.by_index_string = None
+        if hasattr(enum, 'from_index'):
+            self.by_index = {}
+            for member in self.members:
+                self.by_index.setdefault(member.index, member)
+            # Indices as they appear in serialized data and form input.
+            self.by_index_string = dict((str(index), member) for index, member in self.by_index.items())
+
+        self._choices = {}
+        self._prefix_indexes = {}
+
+    def choices(self, value_field='canonical_name'):
+        '''The enum's choices, as an immutable tuple shared by every caller.'''
+        try:
+            return self._choices[value_field]
+        except KeyError:
+            choices = self._choices[value_field] = tuple(self.enum.choices(value_field=value_field))
+            return choices
+
+    def search(self, term):
+        '''The members matching a search term (see PrefixIndex), in enum order.
+
+        Display names can be translated, so there's an index per language.
+        '''
+        language = get_language()
+        try:
+            index = self._prefix_indexes[language]
+        except KeyError:
+            index = self._prefix_indexes[language] = PrefixIndex(self.members)
+        return index.search(term)
+
+    def from_canonical(self, canonical_name):
+        try:
+            return self.by_canonical[canonical_name]
+        except (KeyError, TypeError):
+            # Let richenum handle anything unusual and raise its own
+            # LookupError for values that aren't members.
+            return self.enum.from_canonical(canonical_name)
+
+    def from_index(self, index):
+        try:
+            return self.by_index[index]
+        except (KeyError, TypeError):
+            return self.enum.from_index(index)
+
+    def from_index_string(self, index):
+        # Raises ValueError for strings that aren't ints.
+        try:
+            return self.by_index_string[index]
+        except (KeyError, TypeError):
+            return self.from_index(int(index))
+
+
+def get_lookup_table(enum):
+    '''Return the (cached) LookupTable for an enum.
+
+    '''
+    try:
+        return _LOOKUP_TABLES[enum]
+    except KeyError:
+        table = _LOOKUP_TABLES[enum] = LookupTable(enum)
+        return table
+
+
+def clear_lookup_tables(enum=None):
+    '''Drop cached lookup tables, for a single enum or for all of them.
+
+    Call this after modifying an enum's members (e.g. in tests), so that the
+    next conversion rebuilds the table.
+    '''
+    if enum is None:
+        _LOOKUP_TABLES.clear()
+    else:
+        _LOOKUP_TABLES.pop(enum, None)
@@ -0,0 +1,73 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count
+
+from django_richenum.lookup_tables import get_lookup_table
+from django_richenum.models.fields import ENUM_FIELD_CLASSES
+from django_richenum.models.fields import IndexEnumField
+from django_richenum.models.fields import LaxIndexEnumField
+from django_richenum.models.query import RichEnumQuerySet
+
+
+def _is_known(field, value):
+    table = get_lookup_table(field.enum)
+    if isinstance(field, LaxIndexEnumField) and isinstance(value, str):
+        return value in table.by_canonical
+    if isinstance(field, IndexEnumField):
+        return value in table.by_index
+    return value in table.by_canonical
+
+
+def find_unknown_values(model, field, using=DEFAULT_DB_ALIAS):
+    '''Return {stored value: row count} for the values of an enum field that
+    aren't members of its enum, with a single GROUP BY query.
+    '''
+    rows = RichEnumQuerySet(model=model, using=using).enum_raw(field.name).order_by().values_list(
+        field.name).annotate(_enum_count=Count('*'))
+    return dict((value, count) for value, count in rows if value is not None and not _is_known(field, value))
+
+
+class Command(BaseCommand):
+    help = ('Find stored values of enum fields that are no longer members of their enums. '
+            'Exits with status 1 if there are any.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('labels', nargs='*', metavar='app_label[.ModelName]',
+                            help='Only audit these apps or models.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to audit.')
+
+    def get_models(self, labels):
+        if not labels:
+            return apps.get_models()
+        models = []
+        for label in labels:
+            try:
+                if '.' in label:
+                    models.append(apps.get_model(label))
+                else:
+                    models.extend(apps.get_app_config(label).get_models())
+            except LookupError as e:
+                raise CommandError(str(e))
+        return models
+
+    def handle(self, *args, **options):
+        unknown_rows = 0
+        for model in self.get_models(options['labels']):
+            opts = model._meta
+            if opts.proxy or not opts.managed:
+                continue
+            for field in opts.concrete_fields:
+                if not isinstance(field, ENUM_FIELD_CLASSES):
+                    continue
+                unknown = find_unknown_values(model, field, using=options['database'])
+                for value, count in sorted(unknown.items(), key=lambda item: str(item[0])):
+                    self.stdout.write('%s.%s: %d rows with unknown value %r' % (opts.label, field.name, count, value))
+                    unknown_rows += count
+                if options['verbosity'] >= 2 and not unknown:
+                    self.stdout.write('%s.%s: OK' % (opts.label, field.name))
+
+        if unknown_rows:
+            raise CommandError('Found %d rows with unknown enum values.' % unknown_rows, returncode=1)
+        self.stdout.write(self.style.SUCCESS('No unknown enum values.'))  # pylint: disable=no-member
@@ -0,0 +1,41 @@
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from django_richenum.models.backfill import backfill_index_from_canonical
+
+
+class Command(BaseCommand):
+    help = ('Copy canonical names from one column of a model into an IndexEnumField, '
+            'using batched UPDATEs over primary key ranges.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='Model to backfill, as app_label.ModelName.')
+        parser.add_argument('source', help='Name of the field holding canonical names.')
+        parser.add_argument('target', help='Name of the IndexEnumField to fill in.')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Number of primary keys per UPDATE.')
+        parser.add_argument('--start', type=int, help='Primary key to start (or resume) from.')
+        parser.add_argument('--workers', type=int, default=1, help='Number of batches to run in parallel.')
+        parser.add_argument('--database', help='Database to backfill (defaults to the router\'s choice).')
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+
+        def report(progress):
+            if options['verbosity'] >= 1:
+                self.stdout.write('Updated %d rows; next pk %d of %d (resume with --start %d).' % (
+                    progress.updated, progress.next_pk, progress.max_pk, progress.next_pk))
+
+        try:
+            updated = backfill_index_from_canonical(
+                model, options['source'], options['target'],
+                batch_size=options['batch_size'], start=options['start'], workers=options['workers'],
+                progress=report, using=options['database'])
+        except (FieldDoesNotExist, TypeError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS('Backfilled %d rows.' % updated))  # pylint: disable=no-member
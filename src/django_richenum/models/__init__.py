@@ -1,10 +1,35 @@
 from .fields import IndexEnumField  # noqa
 from .fields import LaxIndexEnumField  # noqa
+from .fields import SmallIndexEnumField  # noqa
 from .fields import CanonicalNameEnumField  # noqa
+from .fields import EnumSetField  # noqa
+from .fields import MultipleCanonicalNameEnumField  # noqa
+from .backfill import backfill_index_from_canonical  # noqa
+from .constraints import EnumCheckConstraint  # noqa
+from .expressions import EnumDisplay  # noqa
+from .expressions import EnumOrder  # noqa
+from .indexes import EnumPartialIndex  # noqa
+from .mixins import EnumPickleMixin  # noqa
+from . import lookups  # noqa
+from .query import RichEnumManager  # noqa
+from .query import RichEnumQuerySet  # noqa
+from .query import RichEnumQuerySetMixin  # noqa
 
 
 __all__ = (
     'IndexEnumField',
     'LaxIndexEnumField',
+    'SmallIndexEnumField',
     'CanonicalNameEnumField',
+    'EnumSetField',
+    'MultipleCanonicalNameEnumField',
+    'EnumCheckConstraint',
+    'EnumDisplay',
+    'EnumOrder',
+    'EnumPartialIndex',
+    'EnumPickleMixin',
+    'RichEnumManager',
+    'RichEnumQuerySet',
+    'RichEnumQuerySetMixin',
+    'backfill_index_from_canonical',
 )
@@ -0,0 +1,143 @@
+from collections import namedtuple
+import queue
+import threading
+
+from django.db import connections
+from django.db import models
+from django.db import router
+from django.db.models import Case
+from django.db.models import F
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import Value
+from django.db.models import When
+
+from ..lookup_tables import get_lookup_table
+from .fields import IndexEnumField
+
+# next_pk: the lowest pk that hasn't been backfilled yet (pass it as start to
+#          resume); max_pk + 1 once everything has been.
+# max_pk: the highest pk to backfill.
+# updated: number of rows updated so far.
+BackfillProgress = namedtuple('BackfillProgress', ['next_pk', 'max_pk', 'updated'])
+
+
+def _pk_ranges(low, high, batch_size):
+    # Half-open [start, stop) ranges covering low..high.
+    return [(start, min(start + batch_size, high + 1)) for start in range(low, high + 1, batch_size)]
+
+
+class _Batches(object):
+    '''Tracks which pk ranges are done, for reporting a resumable position
+    while several workers update ranges out of order.
+    '''
+    def __init__(self, ranges, max_pk, progress):
+        self.ranges = ranges
+        self.max_pk = max_pk
+        self.progress = progress
+        self.done = [False] * len(ranges)
+        self.next_index = 0
+        self.updated = 0
+        self.lock = threading.Lock()
+
+    def finish(self, index, updated):
+        with self.lock:
+            self.done[index] = True
+            self.updated += updated
+            while self.next_index < len(self.ranges) and self.done[self.next_index]:
+                self.next_index += 1
+            if self.progress is not None:
+                if self.next_index < len(self.ranges):
+                    next_pk = self.ranges[self.next_index][0]
+                else:
+                    next_pk = self.max_pk + 1
+                self.progress(BackfillProgress(next_pk, self.max_pk, self.updated))
+
+
+def backfill_index_from_canonical(model, source, target, batch_size=10000, start=None, workers=1,
+                                  progress=None, using=None):
+    '''Copy a column of canonical names into an IndexEnumField, in the database.
+
+    Each batch is a single UPDATE ... SET target = CASE source WHEN ... built
+    from the target's enum, over a range of primary keys, and commits on its
+    own (unless called inside a transaction). Rows whose source isn't one of
+    the enum's canonical names are left alone.
+
+    Pass start to resume from a given pk. progress is called after each
+    batch with a BackfillProgress. With workers > 1, batches run in that many
+    threads, each with its own database connection and so outside any
+    transaction of the caller's; that raises ValueError inside atomic().
+
+    Returns the number of rows updated. Also usable from a RunPython
+    migration, with the historical model (with workers=1, unless the
+    migration is non-atomic).
+    '''
+    opts = model._meta
+    target_field = opts.get_field(target)
+    if not isinstance(target_field, IndexEnumField):
+        raise TypeError('%s is not an IndexEnumField.' % target)
+    opts.get_field(source)
+    if not isinstance(opts.pk, models.IntegerField):
+        raise TypeError('%s must have an integer primary key to be backfilled in batches.' % opts.label)
+    if batch_size < 1 or workers < 1:
+        raise ValueError('batch_size and workers must be positive.')
+    using = using or router.db_for_write(model)
+    if workers > 1 and connections[using].in_atomic_block:
+        # The workers' connections would wait on locks held by this
+        # transaction (forever, on databases without a lock timeout).
+        raise ValueError('workers > 1 cannot be used inside a transaction.')
+
+    members = get_lookup_table(target_field.enum).members
+    case = Case(
+        *[When(**{source: member.canonical_name, 'then': Value(member.index)}) for member in members],
+        default=F(target),
+        output_field=models.IntegerField()
+    )
+    queryset = model._base_manager.using(using).filter(
+        **{'%s__in' % source: [member.canonical_name for member in members]})
+
+    bounds = queryset.aggregate(min_pk=Min('pk'), max_pk=Max('pk'))
+    if bounds['min_pk'] is None:
+        return 0
+    low = bounds['min_pk'] if start is None else max(start, bounds['min_pk'])
+    if low > bounds['max_pk']:
+        return 0
+    ranges = _pk_ranges(low, bounds['max_pk'], batch_size)
+    batches = _Batches(ranges, bounds['max_pk'], progress)
+
+    def update(index):
+        range_start, range_stop = ranges[index]
+        updated = queryset.filter(pk__gte=range_start, pk__lt=range_stop).update(**{target: case})
+        batches.finish(index, updated)
+
+    if workers == 1:
+        for index in range(len(ranges)):
+            update(index)
+        return batches.updated
+
+    pending = queue.Queue()
+    for index in range(len(ranges)):
+        pending.put(index)
+    errors = []
+
+    def work():
+        try:
+            while not errors:
+                try:
+                    index = pending.get_nowait()
+                except queue.Empty:
+                    return
+                update(index)
+        except Exception as e:  # pylint: disable=broad-except
+            errors.append(e)
+        finally:
+            connections[using].close()
+
+    threads = [threading.Thread(target=work) for _ in range(min(workers, len(ranges)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return batches.updated
@@ -0,0 +1,50 @@
+from django.db import models
+
+
+def stored_values(members, value_field):
+    # Distinct stored values of enum members, in the given order.
+    values = []
+    for member in members:
+        value = getattr(member, value_field)
+        if value not in values:
+            values.append(value)
+    return values
+
+
+class EnumCheckConstraint(models.CheckConstraint):
+    '''CHECK constraint restricting an enum column to the enum's stored values.
+
+        class Meta:
+            constraints = [EnumCheckConstraint(field_name='my_enum', enum=MyEnum)]
+
+    value_field is the member attribute stored in the column; it defaults to
+    'index' for OrderedRichEnums and 'canonical_name' otherwise, so pass
+    value_field='canonical_name' for a CanonicalNameEnumField holding an
+    OrderedRichEnum. NULLs always pass the check.
+
+    Deconstructs to a plain CheckConstraint listing the values, so migrations
+    don't import the enum, and adding or removing members shows up as a
+    changed constraint in makemigrations.
+    '''
+    def __init__(self, *, field_name, enum, name=None, value_field=None, **kwargs):
+        if value_field is None:
+            value_field = 'index' if hasattr(enum, 'from_index') else 'canonical_name'
+        if name is None:
+            name = '%%(app_label)s_%%(class)s_%s_enum' % field_name
+        self.field_name = field_name
+        self.enum = enum
+        self.value_field = value_field
+        check = models.Q(**{'%s__in' % field_name: stored_values(enum.members(), value_field)})
+        super(EnumCheckConstraint, self).__init__(check=check, name=name, **kwargs)
+
+    def __repr__(self):
+        return '<%s: field_name=%r enum=%s name=%r>' % (
+            self.__class__.__name__, self.field_name, self.enum.__name__, self.name)
+
+    def deconstruct(self):
+        path, args, kwargs = super(EnumCheckConstraint, self).deconstruct()
+        return 'django.db.models.CheckConstraint', args, kwargs
+
+    def clone(self):
+        _, args, kwargs = self.deconstruct()
+        return models.CheckConstraint(*args, **kwargs)
@@ -0,0 +1,78 @@
+from abc import ABCMeta
+from abc import abstractmethod
+
+from django.db import models
+from django.db.models import Case
+from django.db.models import F
+from django.db.models import Value
+from django.db.models import When
+
+from .fields import ENUM_FIELD_CLASSES
+from .fields import IndexEnumField
+
+
+class _EnumCase(models.Expression, metaclass=ABCMeta):
+    '''Base for expressions computed in SQL from an enum field's stored value.
+
+    The enum is only known once the field reference is resolved against a
+    query, at which point the expression is replaced by a CASE statement with
+    one WHEN per enum member.
+    '''
+    def __init__(self, expression):
+        if isinstance(expression, str):
+            expression = F(expression)
+        if not isinstance(expression, F):
+            raise TypeError('%s only supports field references, not %r.' % (self.__class__.__name__, expression))
+        self.expression = expression
+        super(_EnumCase, self).__init__(output_field=self.get_output_field())
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.expression)
+
+    @abstractmethod
+    def get_output_field(self):
+        pass
+
+    @abstractmethod
+    def get_member_value(self, position, member):
+        pass
+
+    def resolve_expression(self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False):
+        name = self.expression.name
+        field = self.expression.resolve_expression(query, allow_joins, reuse, summarize, for_save).output_field
+        if not isinstance(field, ENUM_FIELD_CLASSES):
+            raise TypeError('%s is not an enum field.' % name)
+
+        value_field = 'index' if isinstance(field, IndexEnumField) else 'canonical_name'
+        whens = [
+            When(**{name: getattr(member, value_field), 'then': Value(self.get_member_value(position, member))})
+            for position, member in enumerate(field.enum.members())
+        ]
+        case = Case(*whens, default=Value(None), output_field=self.get_output_field())
+        return case.resolve_expression(query, allow_joins, reuse, summarize, for_save)
+
+
+class EnumDisplay(_EnumCase):
+    '''The display name of an enum field's value (in the active language),
+    for annotating, grouping or ordering in the database.
+
+        >>> MyModel.objects.order_by(EnumDisplay('my_enum'))
+    '''
+    def get_output_field(self):
+        return models.CharField()
+
+    def get_member_value(self, position, member):
+        return str(member.display_name)
+
+
+class EnumOrder(_EnumCase):
+    '''The position of an enum field's value in its enum (index order for
+    OrderedRichEnums, declaration order for RichEnums).
+
+        >>> MyModel.objects.order_by(EnumOrder('my_enum'))
+    '''
+    def get_output_field(self):
+        return models.IntegerField()
+
+    def get_member_value(self, position, member):
+        return position
@@ -1,7 +1,20 @@
+from django.core import checks
 from django.db import models
+from django.db.backends.base.operations import BaseDatabaseOperations
+from django.forms.widgets import ChoiceWidget
 from richenum import OrderedRichEnumValue
 from richenum import RichEnumValue
 
+from ..lookup_tables import get_lookup_table
+
+
+def _is_choice_widget(widget):
+    # Whether widget (a class or an instance) can render an enum's choices.
+    # Widgets for the underlying column type, such as those a plain
+    # ModelAdmin's formfield_overrides gives IntegerField or CharField, can't.
+    widget_cls = widget if isinstance(widget, type) else type(widget)
+    return issubclass(widget_cls, ChoiceWidget)
+
 
 # https://github.com/django/django/blob/64200c14e0072ba0ffef86da46b2ea82fd1e019a/django/db/models/fields/subclassing.py#L31-L44
 class Creator(object):
@@ -20,27 +33,53 @@ class Creator(object):
         obj.__dict__[self.field.name] = self.field.to_python(value)
 
 
+class LazyCreator(Creator):
+    """
+    Like Creator, but stores assigned (and loaded) values as-is and converts
+    them the first time the attribute is read, caching the result on the
+    instance.
+    """
+    def __get__(self, obj, type=None):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.field.name]
+        converted = self.field.to_python(value)
+        if converted is not value:
+            obj.__dict__[self.field.name] = converted
+        return converted
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.field.name] = value
+
+
 class IndexEnumField(models.IntegerField):
     '''Store ints in DB, but expose OrderedRichEnumValues in Python.
 
     '''
     description = 'Efficient storage for OrderedRichEnums'
+    # Changing laziness never requires a schema change (Django >= 4.1).
+    non_db_attrs = getattr(models.IntegerField, 'non_db_attrs', ()) + ('lazy',)
 
     def contribute_to_class(self, cls, name, **kwargs):
         super(IndexEnumField, self).contribute_to_class(cls, name, **kwargs)
 
         # Add Creator descriptor to allow the field to be set directly
-        setattr(cls, self.name, Creator(self))
+        creator_cls = LazyCreator if self.lazy else Creator
+        setattr(cls, self.name, creator_cls(self))
 
     def __init__(self, enum, *args, **kwargs):
         if not hasattr(enum, 'from_index'):
             raise TypeError("%s doesn't support index-based lookup." % enum)
         self.enum = enum
+        # Lazy fields defer converting assigned values until they're read.
+        self.lazy = kwargs.pop('lazy', False)
         super(IndexEnumField, self).__init__(*args, **kwargs)
 
     def deconstruct(self):
         name, path, args, kwargs = super(IndexEnumField, self).deconstruct()
         args.insert(0, self.enum)
+        if self.lazy:
+            kwargs['lazy'] = True
 
         return name, path, args, kwargs
 
@@ -53,6 +92,12 @@ class IndexEnumField(models.IntegerField):
             return self.default
         return None
 
+    def pre_save(self, model_instance, add):
+        if self.lazy:
+            # Save whatever was assigned without converting it to an enum value.
+            return model_instance.__dict__[self.attname]
+        return super(IndexEnumField, self).pre_save(model_instance, add)
+
     def get_prep_value(self, value):
         # Convert value to integer for storage/queries.
         if value is None:
@@ -67,9 +112,10 @@ class IndexEnumField(models.IntegerField):
     def from_db_value(self, value, expression, connection, *args):
         # context param is deprecated in Django 2.x will be removed in Django 3.x
         # having *args allows this code to run in Django 1.x and Django 2.x
-        if value is None:
+        if value is None or self.lazy:
+            # Lazy fields are converted when the attribute is first read.
             return value
-        return self.enum.from_index(value)
+        return get_lookup_table(self.enum).from_index(value)
 
     def to_python(self, value):
         # Convert value to OrderedRichEnumValue. (Called on *all* assignments
@@ -79,9 +125,22 @@ class IndexEnumField(models.IntegerField):
         elif isinstance(value, OrderedRichEnumValue):
             return value
         elif isinstance(value, int):
-            return self.enum.from_index(value)
-        else:
-            raise TypeError('Cannot interpret %s (%s) as an OrderedRichEnumValue.' % (value, type(value)))
+            return get_lookup_table(self.enum).from_index(value)
+        elif isinstance(value, str):
+            # Indices are strings in serialized data (see value_to_string).
+            try:
+                return get_lookup_table(self.enum).from_index_string(value)
+            except ValueError:
+                pass
+        raise TypeError('Cannot interpret %s (%s) as an OrderedRichEnumValue.' % (value, type(value)))
+
+    def value_to_string(self, obj):
+        # Serialize the stored form (the index) rather than str() of the
+        # enum value.
+        value = self.value_from_object(obj)
+        if value is None:
+            return None
+        return str(self.get_prep_value(value))
 
     def run_validators(self, value):
         """
@@ -102,6 +161,10 @@ class IndexEnumField(models.IntegerField):
 
         defaults = {"enum": self.enum, "form_class": IndexEnumFormField,
                     "choices_form_class": IndexEnumFormField}
+        # Other kwargs are ignored, but a select-like widget (such as the
+        # admin's EnumAutocompleteSelect) is kept.
+        if _is_choice_widget(kwargs.get('widget')):
+            defaults['widget'] = kwargs['widget']
         return super(IndexEnumField, self).formfield(**defaults)
 
 
@@ -113,43 +176,100 @@ class LaxIndexEnumField(IndexEnumField):
     '''
     def get_prep_value(self, value):
         if isinstance(value, str):
-            return self.enum.from_canonical(value).index
+            return get_lookup_table(self.enum).from_canonical(value).index
         return super(LaxIndexEnumField, self).get_prep_value(value)
 
     def from_db_value(self, value, expression, connection, *args):
         # context param is deprecated in Django 2.x will be removed in Django 3.x
         # having *args allows this code to run in Django 1.x and Django 2.x
-        if isinstance(value, str):
-            return self.enum.from_canonical(value)
+        if isinstance(value, str) and not self.lazy:
+            return get_lookup_table(self.enum).from_canonical(value)
         return super(LaxIndexEnumField, self).from_db_value(value, expression, connection, *args)
 
     def to_python(self, value):
         if isinstance(value, str):
-            return self.enum.from_canonical(value)
+            table = get_lookup_table(self.enum)
+            try:
+                return table.by_canonical[value]
+            except KeyError:
+                pass
+            try:
+                return table.from_index_string(value)
+            except ValueError:
+                return table.from_canonical(value)
         return super(LaxIndexEnumField, self).to_python(value)
 
 
+class SmallIndexEnumField(IndexEnumField):
+    '''Like IndexEnumField, but stored in a smallint column.
+
+    (richenum indices are never negative, so PositiveSmallIntegerField
+    storage is used.)
+    '''
+    description = 'Compact storage for OrderedRichEnums'
+
+    def get_internal_type(self):
+        return 'PositiveSmallIntegerField'
+
+    def check(self, **kwargs):
+        errors = super(SmallIndexEnumField, self).check(**kwargs)
+        min_value, max_value = BaseDatabaseOperations.integer_field_ranges[self.get_internal_type()]
+        out_of_range = [member for member in self.enum.members() if not min_value <= member.index <= max_value]
+        if out_of_range:
+            errors.append(checks.Error(
+                '%s has members with indices outside %d..%d, which cannot be stored in a %s: %s.' % (
+                    self.enum.__name__, min_value, max_value, self.get_internal_type(),
+                    ', '.join(member.canonical_name for member in out_of_range)),
+                obj=self,
+                id='django_richenum.E002',
+            ))
+        return errors
+
+
 class CanonicalNameEnumField(models.CharField):
     '''Store varchar in DB, but expose RichEnumValues in Python.
 
+    If max_length isn't given, it's set to the length of the enum's longest
+    canonical name.
     '''
     description = 'Storage for RichEnums'
+    # Changing laziness never requires a schema change (Django >= 4.1).
+    non_db_attrs = getattr(models.CharField, 'non_db_attrs', ()) + ('lazy',)
 
     def contribute_to_class(self, cls, name, **kwargs):
         super(CanonicalNameEnumField, self).contribute_to_class(cls, name, **kwargs)
 
         # Add Creator descriptor to allow the field to be set directly
-        setattr(cls, self.name, Creator(self))
+        creator_cls = LazyCreator if self.lazy else Creator
+        setattr(cls, self.name, creator_cls(self))
 
     def __init__(self, enum, *args, **kwargs):
         if not hasattr(enum, 'from_canonical'):
             raise TypeError("%s doesn't support canonical_name lookup." % enum)
         self.enum = enum
+        # Lazy fields defer converting assigned values until they're read.
+        self.lazy = kwargs.pop('lazy', False)
+        if kwargs.get('max_length') is None:
+            kwargs['max_length'] = max([len(member.canonical_name) for member in enum.members()] or [1])
         super(CanonicalNameEnumField, self).__init__(*args, **kwargs)
 
+    def check(self, **kwargs):
+        errors = super(CanonicalNameEnumField, self).check(**kwargs)
+        too_long = [member for member in self.enum.members() if len(member.canonical_name) > self.max_length]
+        if too_long:
+            errors.append(checks.Error(
+                '%s has canonical names longer than max_length=%d: %s.' % (
+                    self.enum.__name__, self.max_length, ', '.join(member.canonical_name for member in too_long)),
+                obj=self,
+                id='django_richenum.E003',
+            ))
+        return errors
+
     def deconstruct(self):
         name, path, args, kwargs = super(CanonicalNameEnumField, self).deconstruct()
         args.insert(0, self.enum)
+        if self.lazy:
+            kwargs['lazy'] = True
 
         return name, path, args, kwargs
 
@@ -162,6 +282,12 @@ class CanonicalNameEnumField(models.CharField):
             return self.default
         return None
 
+    def pre_save(self, model_instance, add):
+        if self.lazy:
+            # Save whatever was assigned without converting it to an enum value.
+            return model_instance.__dict__[self.attname]
+        return super(CanonicalNameEnumField, self).pre_save(model_instance, add)
+
     def get_prep_value(self, value):
         # Convert value to string for storage/queries.
         if value is None:
@@ -176,9 +302,10 @@ class CanonicalNameEnumField(models.CharField):
     def from_db_value(self, value, expression, connection, *args):
         # context param is deprecated in Django 2.x will be removed in Django 3.x
         # having *args allows this code to run in Django 1.x and Django 2.x
-        if value is None:
+        if value is None or self.lazy:
+            # Lazy fields are converted when the attribute is first read.
             return value
-        return self.enum.from_canonical(value)
+        return get_lookup_table(self.enum).from_canonical(value)
 
     def to_python(self, value):
         # Convert value to RichEnumValue. (Called on *all* assignments
@@ -188,10 +315,18 @@ class CanonicalNameEnumField(models.CharField):
         elif isinstance(value, RichEnumValue):
             return value
         elif isinstance(value, str):
-            return self.enum.from_canonical(value)
+            return get_lookup_table(self.enum).from_canonical(value)
         else:
             raise TypeError('Cannot interpret %s (%s) as an RichEnumValue.' % (value, type(value)))
 
+    def value_to_string(self, obj):
+        # Serialize the stored form (the canonical name) rather than str() of
+        # the enum value.
+        value = self.value_from_object(obj)
+        if value is None:
+            return None
+        return self.get_prep_value(value)
+
     def run_validators(self, value):
         """
         Validate that the value is of the correct type for Model field validation
@@ -211,17 +346,270 @@ class CanonicalNameEnumField(models.CharField):
 
         defaults = {"enum": self.enum, "form_class": CanonicalEnumFormField,
                     "choices_form_class": CanonicalEnumFormField}
+        # Other kwargs are ignored, but a select-like widget (such as the
+        # admin's EnumAutocompleteSelect) is kept.
+        if _is_choice_widget(kwargs.get('widget')):
+            defaults['widget'] = kwargs['widget']
         # Don't use super(CanonicalNameEnumField, self) since
         # that'll send the unsupported max_length kwarg to the CanonicalEnumFormField
         return super(models.CharField, self).formfield(**defaults)  # pylint: disable=E1003
 
 
+class EnumSetField(models.BigIntegerField):
+    '''Store sets of OrderedRichEnumValues as a bitmask in DB (bit N set
+    for the member with index N), but expose frozensets in Python.
+
+    '''
+    description = 'Bitmask storage for sets of OrderedRichEnums'
+    # Bit 63 is the sign bit of a BIGINT.
+    MAX_INDEX = 62
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super(EnumSetField, self).contribute_to_class(cls, name, **kwargs)
+
+        # Add Creator descriptor to allow the field to be set directly
+        setattr(cls, self.name, Creator(self))
+
+    def __init__(self, enum, *args, **kwargs):
+        if not hasattr(enum, 'from_index'):
+            raise TypeError("%s doesn't support index-based lookup." % enum)
+        self.enum = enum
+        super(EnumSetField, self).__init__(*args, **kwargs)
+
+    def check(self, **kwargs):
+        errors = super(EnumSetField, self).check(**kwargs)
+        too_large = [member for member in self.enum.members() if member.index > self.MAX_INDEX]
+        if too_large:
+            errors.append(checks.Error(
+                '%s has members with indices above %d, which cannot be stored in a bitmask: %s.' % (
+                    self.enum.__name__, self.MAX_INDEX, ', '.join(member.canonical_name for member in too_large)),
+                obj=self,
+                id='django_richenum.E001',
+            ))
+        return errors
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(EnumSetField, self).deconstruct()
+        args.insert(0, self.enum)
+
+        return name, path, args, kwargs
+
+    def get_default(self):
+        # Override Django's implementation, which casts all default values to
+        # unicode.
+        if self.has_default():
+            if callable(self.default):
+                return self.default()
+            return self.default
+        return None
+
+    def get_prep_value(self, value):
+        # Convert value to a bitmask for storage/queries. Accepts a bitmask
+        # (int), a single enum value, or an iterable of enum values/indices.
+        if value is None:
+            return None
+        elif isinstance(value, int):
+            return value
+        elif isinstance(value, OrderedRichEnumValue):
+            return 1 << value.index
+        elif isinstance(value, (str, bytes)):
+            raise TypeError('Cannot convert value: %s (%s) to a bitmask.' % (value, type(value)))
+
+        try:
+            members = iter(value)
+        except TypeError:
+            raise TypeError('Cannot convert value: %s (%s) to a bitmask.' % (value, type(value)))
+
+        mask = 0
+        for member in members:
+            if isinstance(member, OrderedRichEnumValue):
+                mask |= 1 << member.index
+            elif isinstance(member, int):
+                mask |= 1 << member
+            else:
+                raise TypeError('Cannot convert value: %s (%s) to a bitmask.' % (member, type(member)))
+        return mask
+
+    def from_db_value(self, value, expression, connection, *args):
+        if value is None:
+            return value
+        return self.to_python(value)
+
+    def to_python(self, value):
+        # Convert value to a frozenset of OrderedRichEnumValues. (Called on
+        # *all* assignments to the field, including object creation from a DB
+        # record.)
+        if value is None or isinstance(value, frozenset):
+            return value
+        elif isinstance(value, int):
+            table = get_lookup_table(self.enum)
+            members = []
+            while value > 0:
+                bit = value & -value
+                members.append(table.from_index(bit.bit_length() - 1))
+                value ^= bit
+            if value < 0:
+                raise TypeError('Cannot interpret negative bitmask %s as a set of enum values.' % value)
+            return frozenset(members)
+        elif isinstance(value, OrderedRichEnumValue):
+            return frozenset((value, ))
+        elif isinstance(value, str):
+            # Bitmasks are strings in serialized data (see value_to_string).
+            try:
+                return self.to_python(int(value))
+            except ValueError:
+                pass
+        if isinstance(value, (str, bytes)):
+            raise TypeError('Cannot interpret %s (%s) as a set of OrderedRichEnumValues.' % (value, type(value)))
+        return self.to_python(self.get_prep_value(value))
+
+    def value_to_string(self, obj):
+        # Serialize the stored bitmask rather than str() of the frozenset.
+        value = self.value_from_object(obj)
+        if value is None:
+            return None
+        return str(self.get_prep_value(value))
+
+    def run_validators(self, value):
+        """
+        Validate the bitmask that will be stored, rather than the set.
+        """
+        return super(EnumSetField, self).run_validators(self.get_prep_value(value))
+
+    def formfield(self, **kwargs):
+        # import here to avoid circular imports
+        from django_richenum.forms.fields import MultipleIndexEnumField as MultipleIndexEnumFormField
+
+        defaults = {"enum": self.enum, "form_class": MultipleIndexEnumFormField,
+                    "choices_form_class": MultipleIndexEnumFormField}
+        if 'widget' in kwargs and not _is_choice_widget(kwargs['widget']):
+            # e.g. a plain ModelAdmin's AdminBigIntegerFieldWidget
+            del kwargs['widget']
+        defaults.update(kwargs)
+        # Don't use super(EnumSetField, self) since that'll send the
+        # unsupported min_value/max_value kwargs to the form field
+        return super(models.BigIntegerField, self).formfield(**defaults)  # pylint: disable=E1003
+
+
+class MultipleCanonicalNameEnumField(models.JSONField):
+    '''Store a sorted JSON list of canonical names in DB, but expose tuples
+    of RichEnumValues in Python.
+
+    Supports __contains_enum and __overlaps lookups, evaluated in the DB
+    (on Postgres, add a GinIndex on the field to make them indexed).
+    '''
+    description = 'JSON storage for multiple RichEnums'
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super(MultipleCanonicalNameEnumField, self).contribute_to_class(cls, name, **kwargs)
+
+        # Add Creator descriptor to allow the field to be set directly
+        setattr(cls, self.name, Creator(self))
+
+    def __init__(self, enum, *args, **kwargs):
+        if not hasattr(enum, 'from_canonical'):
+            raise TypeError("%s doesn't support canonical_name lookup." % enum)
+        self.enum = enum
+        super(MultipleCanonicalNameEnumField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(MultipleCanonicalNameEnumField, self).deconstruct()
+        args.insert(0, self.enum)
+
+        return name, path, args, kwargs
+
+    def get_default(self):
+        # Override Django's implementation, which casts all default values to
+        # unicode.
+        if self.has_default():
+            if callable(self.default):
+                return self.default()
+            return self.default
+        return None
+
+    def get_canonical_names(self, value):
+        # Convert an enum value, or an iterable of enum values/canonical names,
+        # to a sorted list of distinct canonical names.
+        if isinstance(value, RichEnumValue):
+            return [value.canonical_name]
+        elif isinstance(value, (str, bytes)):
+            raise TypeError('Cannot convert value: %s (%s) to a list of canonical names.' % (value, type(value)))
+
+        try:
+            members = iter(value)
+        except TypeError:
+            raise TypeError('Cannot convert value: %s (%s) to a list of canonical names.' % (value, type(value)))
+
+        names = set()
+        for member in members:
+            if isinstance(member, RichEnumValue):
+                names.add(member.canonical_name)
+            elif isinstance(member, str):
+                names.add(member)
+            else:
+                raise TypeError('Cannot convert value: %s (%s) to a canonical name.' % (member, type(member)))
+        return sorted(names)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        return super(MultipleCanonicalNameEnumField, self).get_prep_value(self.get_canonical_names(value))
+
+    def from_db_value(self, value, expression, connection, *args):
+        value = super(MultipleCanonicalNameEnumField, self).from_db_value(value, expression, connection, *args)
+        if value is None:
+            return value
+        return self.to_python(value)
+
+    def to_python(self, value):
+        # Convert value to a tuple of RichEnumValues, sorted by canonical name.
+        # (Called on *all* assignments to the field, including object creation
+        # from a DB record.)
+        if value is None:
+            return None
+        table = get_lookup_table(self.enum)
+        return tuple(table.from_canonical(name) for name in self.get_canonical_names(value))
+
+    def value_to_string(self, obj):
+        # Like JSONField, return the JSON-compatible value rather than a
+        # string: the stored list of canonical names.
+        value = self.value_from_object(obj)
+        if value is None:
+            return None
+        return self.get_canonical_names(value)
+
+    def validate(self, value, model_instance):
+        # Skip JSONField.validate, which tries to JSON encode the enum values.
+        super(models.JSONField, self).validate(value, model_instance)  # pylint: disable=E1003
+
+    def formfield(self, **kwargs):
+        # import here to avoid circular imports
+        from django_richenum.forms.fields import MultipleCanonicalEnumField as MultipleCanonicalEnumFormField
+
+        defaults = {"enum": self.enum, "form_class": MultipleCanonicalEnumFormField,
+                    "choices_form_class": MultipleCanonicalEnumFormField}
+        if 'widget' in kwargs and not _is_choice_widget(kwargs['widget']):
+            # e.g. a Textarea meant for JSONField
+            del kwargs['widget']
+        defaults.update(kwargs)
+        # Don't use super(MultipleCanonicalNameEnumField, self) since that'll
+        # send the unsupported encoder/decoder kwargs to the form field
+        return super(models.JSONField, self).formfield(**defaults)  # pylint: disable=E1003
+
+
+# LaxIndexEnumField is a subclass of IndexEnumField.
+ENUM_FIELD_CLASSES = (IndexEnumField, CanonicalNameEnumField)
+
+
 try:
     from south.modelsinspector import add_introspection_rules
     add_introspection_rules([], [
         r"^django_richenum\.models\.fields\.IndexEnumField",
         r"^django_richenum\.models\.fields\.LaxIndexEnumField",
+        r"^django_richenum\.models\.fields\.SmallIndexEnumField",
         r"^django_richenum\.models\.fields\.CanonicalNameEnumField",
+        r"^django_richenum\.models\.fields\.EnumSetField",
+        r"^django_richenum\.models\.fields\.MultipleCanonicalNameEnumField",
     ])
 except ImportError:
     pass
@@ -0,0 +1,50 @@
+from django.db import models
+from richenum import OrderedRichEnumValue
+
+from .constraints import stored_values
+
+
+class EnumPartialIndex(models.Index):
+    '''Partial index covering only the rows whose enum field holds one of the
+    given members.
+
+        class Meta:
+            indexes = [EnumPartialIndex(field_name='status', members=[Status.FAILED], name='status_failed')]
+
+    Useful for skewed columns, where queries target the rare values: the
+    index stays small and the common values never touch it. Indexes
+    field_name unless other fields are given.
+
+    value_field is the member attribute stored in the column; it defaults to
+    'index' for OrderedRichEnumValues and 'canonical_name' otherwise, so pass
+    value_field='canonical_name' for a CanonicalNameEnumField holding
+    OrderedRichEnumValues.
+
+    Deconstructs to a plain Index with the condition spelled out, so
+    migrations don't import the enum.
+    '''
+    def __init__(self, *, field_name, members, name, fields=None, value_field=None, **kwargs):
+        members = list(members)
+        if not members:
+            raise ValueError('EnumPartialIndex requires at least one member.')
+        if value_field is None:
+            value_field = 'index' if isinstance(members[0], OrderedRichEnumValue) else 'canonical_name'
+        self.field_name = field_name
+        self.members = members
+        self.value_field = value_field
+
+        values = stored_values(members, value_field)
+        if len(values) == 1:
+            condition = models.Q(**{field_name: values[0]})
+        else:
+            condition = models.Q(**{'%s__in' % field_name: values})
+        super(EnumPartialIndex, self).__init__(
+            fields=fields or [field_name], name=name, condition=condition, **kwargs)
+
+    def deconstruct(self):
+        _, args, kwargs = super(EnumPartialIndex, self).deconstruct()
+        return 'django.db.models.Index', args, kwargs
+
+    def clone(self):
+        _, args, kwargs = self.deconstruct()
+        return models.Index(*args, **kwargs)
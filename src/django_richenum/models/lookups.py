@@ -0,0 +1,193 @@
+from abc import ABCMeta
+from abc import abstractmethod
+import json
+import operator
+
+from django.core.exceptions import EmptyResultSet
+from django.db import NotSupportedError
+from django.db.models import Lookup
+from django.db.models.lookups import In
+from django.db.models.lookups import Range
+
+from .fields import CanonicalNameEnumField
+from .fields import EnumSetField
+from .fields import IndexEnumField
+from .fields import MultipleCanonicalNameEnumField
+
+
+class EnumIn(In):
+    '''__in that only prepares each distinct object once.
+
+    Large __in lists of enum values repeat the same few members many times
+    over, so deduplicating by identity first (which, unlike hashing the
+    values, is cheap) leaves get_prep_value with at most a handful of calls.
+    The prepared values are deduplicated again when the SQL is built.
+    '''
+    def get_prep_lookup(self):
+        if self.prepare_rhs and not hasattr(self.rhs, 'resolve_expression'):
+            self.rhs = list({id(value): value for value in self.rhs}.values())
+        return super(EnumIn, self).get_prep_lookup()
+
+
+IndexEnumField.register_lookup(EnumIn)
+CanonicalNameEnumField.register_lookup(EnumIn)
+
+
+@IndexEnumField.register_lookup
+class IndexBetween(Range):
+    '''field__between=(low, high): inclusive range of enum values.
+
+    Same as __range, which (like __gt/__gte/__lt/__lte) already compares
+    indices on the column.
+    '''
+    lookup_name = 'between'
+
+
+class _CanonicalNameOrdering(In, metaclass=ABCMeta):
+    '''Compares enum values in enum order, rather than comparing the stored
+    canonical names as strings.
+
+    Translated to an __in of the canonical names of the qualifying members.
+    '''
+    def get_prep_lookup(self):
+        field = self.lhs.output_field
+        if hasattr(self.rhs, 'resolve_expression'):
+            raise TypeError('__%s on %s only supports enum values.' % (self.lookup_name, field.__class__.__name__))
+        qualifies = self.get_predicate(field, self.rhs)
+        self.rhs = [member.canonical_name for member in field.enum.members() if qualifies(member)]
+        return super(_CanonicalNameOrdering, self).get_prep_lookup()
+
+    @abstractmethod
+    def get_predicate(self, field, value):
+        pass
+
+
+class _CanonicalNameComparison(_CanonicalNameOrdering):
+    compare = None
+
+    def get_predicate(self, field, value):
+        bound = field.to_python(value)
+        return lambda member: self.compare(member, bound)  # pylint: disable=not-callable
+
+
+@CanonicalNameEnumField.register_lookup
+class CanonicalNameGreaterThan(_CanonicalNameComparison):
+    lookup_name = 'gt'
+    compare = staticmethod(operator.gt)
+
+
+@CanonicalNameEnumField.register_lookup
+class CanonicalNameGreaterThanOrEqual(_CanonicalNameComparison):
+    lookup_name = 'gte'
+    compare = staticmethod(operator.ge)
+
+
+@CanonicalNameEnumField.register_lookup
+class CanonicalNameLessThan(_CanonicalNameComparison):
+    lookup_name = 'lt'
+    compare = staticmethod(operator.lt)
+
+
+@CanonicalNameEnumField.register_lookup
+class CanonicalNameLessThanOrEqual(_CanonicalNameComparison):
+    lookup_name = 'lte'
+    compare = staticmethod(operator.le)
+
+
+@CanonicalNameEnumField.register_lookup
+class CanonicalNameBetween(_CanonicalNameOrdering):
+    lookup_name = 'between'
+
+    def get_predicate(self, field, value):
+        low, high = (field.to_python(bound) for bound in value)
+        return lambda member: low <= member <= high
+
+
+@EnumSetField.register_lookup
+class HasAny(Lookup):
+    '''field__has_any=<enum value(s)>: the set contains at least one of them.'''
+    lookup_name = 'has_any'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return '(%s & %s) <> 0' % (lhs, rhs), lhs_params + rhs_params
+
+
+@EnumSetField.register_lookup
+class HasAll(Lookup):
+    '''field__has_all=<enum value(s)>: the set contains all of them.'''
+    lookup_name = 'has_all'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return '(%s & %s) = %s' % (lhs, rhs, rhs), lhs_params + rhs_params + rhs_params
+
+
+class _CanonicalNamesLookup(Lookup):
+    '''Base for lookups on MultipleCanonicalNameEnumField, comparing the
+    stored list with a list of canonical names.
+    '''
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        if hasattr(self.rhs, 'resolve_expression'):
+            raise TypeError('__%s only supports enum values.' % self.lookup_name)
+        names = self.lhs.output_field.get_canonical_names(self.rhs)
+        if not names:
+            self.check_empty()
+        return names
+
+    def check_empty(self):
+        pass
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError('__%s is not supported on %s.' % (self.lookup_name, connection.vendor))
+
+    def process_names(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        if not self.rhs:
+            raise EmptyResultSet
+        return lhs, list(lhs_params), self.rhs
+
+
+@MultipleCanonicalNameEnumField.register_lookup
+class ContainsEnum(_CanonicalNamesLookup):
+    '''field__contains_enum=<enum value(s)>: the list contains all of them.'''
+    lookup_name = 'contains_enum'
+
+    def check_empty(self):
+        raise ValueError('__contains_enum requires at least one enum value.')
+
+    def as_sqlite(self, compiler, connection):
+        lhs, params, names = self.process_names(compiler, connection)
+        return '(SELECT COUNT(*) FROM json_each(%s) WHERE json_each.value IN (%s)) = %d' % (
+            lhs, ', '.join(['%s'] * len(names)), len(names)), params + names
+
+    def as_postgresql(self, compiler, connection):
+        lhs, params, names = self.process_names(compiler, connection)
+        return '%s @> %%s::jsonb' % lhs, params + [json.dumps(names)]
+
+    def as_mysql(self, compiler, connection):
+        lhs, params, names = self.process_names(compiler, connection)
+        return 'JSON_CONTAINS(%s, %%s)' % lhs, params + [json.dumps(names)]
+
+
+@MultipleCanonicalNameEnumField.register_lookup
+class Overlaps(_CanonicalNamesLookup):
+    '''field__overlaps=<enum value(s)>: the list contains at least one of them.'''
+    lookup_name = 'overlaps'
+
+    def as_sqlite(self, compiler, connection):
+        lhs, params, names = self.process_names(compiler, connection)
+        return 'EXISTS (SELECT 1 FROM json_each(%s) WHERE json_each.value IN (%s))' % (
+            lhs, ', '.join(['%s'] * len(names))), params + names
+
+    def as_postgresql(self, compiler, connection):
+        lhs, params, names = self.process_names(compiler, connection)
+        return '%s ?| %%s' % lhs, params + [names]
+
+    def as_mysql(self, compiler, connection):
+        lhs, params, names = self.process_names(compiler, connection)
+        return 'JSON_OVERLAPS(%s, %%s)' % lhs, params + [json.dumps(names)]
@@ -0,0 +1,70 @@
+from ..lookup_tables import get_lookup_table
+from .fields import CanonicalNameEnumField
+from .fields import EnumSetField
+from .fields import IndexEnumField
+from .fields import MultipleCanonicalNameEnumField
+
+_PICKLED_FIELDS = {}
+
+
+def _restore_index(field, value):
+    return get_lookup_table(field.enum).from_index(value)
+
+
+def _restore_canonical(field, value):
+    return get_lookup_table(field.enum).from_canonical(value)
+
+
+def _restore(field, value):
+    return field.to_python(value)
+
+
+def _pickled_fields(model):
+    # The enum fields of a model that EnumPickleMixin handles, as
+    # (field, compact, restore) tuples; compact converts a value to its
+    # stored form, and restore(field, value) converts it back.
+    try:
+        return _PICKLED_FIELDS[model]
+    except KeyError:
+        fields = []
+        for field in model._meta.concrete_fields:
+            if isinstance(field, IndexEnumField):
+                fields.append((field, field.get_prep_value, _restore_index))
+            elif isinstance(field, CanonicalNameEnumField):
+                fields.append((field, field.get_prep_value, _restore_canonical))
+            elif isinstance(field, EnumSetField):
+                fields.append((field, field.get_prep_value, _restore))
+            elif isinstance(field, MultipleCanonicalNameEnumField):
+                fields.append((field, field.get_canonical_names, _restore))
+        _PICKLED_FIELDS[model] = fields
+        return fields
+
+
+class EnumPickleMixin(object):
+    '''Model mixin that pickles enum field values as their stored values
+    (indices, canonical names, bitmasks), rather than as enum value objects.
+
+        class MyModel(EnumPickleMixin, models.Model):
+            ...
+
+    Unpickling converts them back through the cached lookup tables, so
+    instances get the enum's own members (not copies), and pickles are
+    smaller, e.g. for caching instances. Lazy fields are left unconverted
+    until they're read.
+    '''
+    def __getstate__(self):
+        state = super(EnumPickleMixin, self).__getstate__()
+        for field, compact, _ in _pickled_fields(self.__class__):
+            value = state.get(field.attname)
+            if value is not None:
+                state[field.attname] = compact(value)
+        return state
+
+    def __setstate__(self, state):
+        for field, _, restore in _pickled_fields(self.__class__):
+            if getattr(field, 'lazy', False):
+                continue
+            value = state.get(field.attname)
+            if value is not None:
+                state[field.attname] = restore(field, value)
+        super(EnumPickleMixin, self).__setstate__(state)
@@ -0,0 +1,263 @@
+from array import array
+from collections import namedtuple
+import itertools
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Count
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ValuesIterable
+from django.db.models.sql import Query
+
+from ..lookup_tables import get_lookup_table
+from .fields import ENUM_FIELD_CLASSES
+from .fields import IndexEnumField
+
+_RAW_COMPILER_CLASSES = {}
+
+ENUM_FORMATS = ('canonical_name', 'index', 'display_name')
+
+# values: array (or numpy array) of stored indices.
+# decode: tuple mapping each index to its enum value (None for gaps); its last
+#         item is always None, so decode[-1] (the default null_value) is None.
+EnumColumn = namedtuple('EnumColumn', ['values', 'decode'])
+
+
+def _resolve_field(model, name):
+    # Follows relations in name (e.g. 'parent__my_enum') to the field it
+    # refers to. Raises FieldDoesNotExist if there's no such field.
+    field = None
+    for part in name.split(LOOKUP_SEP):
+        if model is None:
+            raise FieldDoesNotExist('%s has no field named %s.' % (field, part))
+        field = model._meta.get_field(part)
+        model = field.related_model
+    return field
+
+
+def _get_enum_field(model, name):
+    field = _resolve_field(model, name)
+    if not isinstance(field, ENUM_FIELD_CLASSES):
+        raise TypeError('%s is not an enum field.' % name)
+    return field
+
+
+def _decoder(field):
+    # Converts a stored (raw) value to an enum value.
+    table = get_lookup_table(field.enum)
+    if isinstance(field, IndexEnumField):
+        return table.from_index
+    return table.from_canonical
+
+
+class _RawEnumCompilerMixin(object):
+    '''Drops enum conversion from the converters Django applies to each row.
+
+    '''
+    def get_converters(self, expressions):
+        converters = super(_RawEnumCompilerMixin, self).get_converters(expressions)
+        for i, (field_converters, expression) in list(converters.items()):
+            field = expression.output_field
+            if not self.query.is_enum_raw(field):
+                continue
+            field_converters = [c for c in field_converters if c != field.from_db_value]
+            if field_converters:
+                converters[i] = (field_converters, expression)
+            else:
+                del converters[i]
+        return converters
+
+
+def _raw_compiler_class(compiler_cls):
+    try:
+        return _RAW_COMPILER_CLASSES[compiler_cls]
+    except KeyError:
+        raw_cls = type('RawEnum%s' % compiler_cls.__name__, (_RawEnumCompilerMixin, compiler_cls), {})
+        _RAW_COMPILER_CLASSES[compiler_cls] = raw_cls
+        return raw_cls
+
+
+class RichEnumQuery(Query):
+    '''Query that can skip converting enum columns to enum values.
+
+    enum_raw_fields is None when conversion is on; otherwise it holds the enum
+    fields to leave raw (an empty set meaning all of them).
+    '''
+    enum_raw_fields = None
+    # Member attribute that enum_values() returns for enum fields.
+    enum_format = 'canonical_name'
+
+    def is_enum_raw(self, field):
+        if self.enum_raw_fields is None or not isinstance(field, ENUM_FIELD_CLASSES):
+            return False
+        return not self.enum_raw_fields or field in self.enum_raw_fields  # pylint: disable=E1135
+
+    def get_compiler(self, *args, **kwargs):
+        compiler = super(RichEnumQuery, self).get_compiler(*args, **kwargs)
+        if self.enum_raw_fields is not None:
+            compiler.__class__ = _raw_compiler_class(compiler.__class__)
+        return compiler
+
+
+def _encoder(field, enum_format):
+    # Converts a stored (raw) value to the enum_format attribute of its enum
+    # value, through a map precomputed for every member.
+    if enum_format == 'display_name':
+        encoded = dict((member, str(member.display_name)) for member in field.enum.members())
+    else:
+        encoded = dict((member, getattr(member, enum_format)) for member in field.enum.members())
+    value_field = 'index' if isinstance(field, IndexEnumField) else 'canonical_name'
+    by_stored = dict((getattr(member, value_field), value) for member, value in encoded.items())
+    decode = _decoder(field)
+
+    def encode(value):
+        try:
+            return by_stored[value]
+        except (KeyError, TypeError):
+            if value is None:
+                return None
+            # Let the lookup table handle (or reject) anything unusual.
+            return encoded[decode(value)]
+    return encode
+
+
+def _selected_enum_fields(queryset):
+    # (name, field) pairs for the enum fields selected by a values() queryset.
+    fields = []
+    for name in queryset.query.values_select:
+        try:
+            field = _resolve_field(queryset.model, name)
+        except FieldDoesNotExist:
+            continue
+        if isinstance(field, ENUM_FIELD_CLASSES):
+            fields.append((name, field))
+    return fields
+
+
+class EnumValuesIterable(ValuesIterable):
+    '''Iterable returned by RichEnumQuerySet.enum_values(): like
+    ValuesIterable, with the model's enum fields converted from their stored
+    values to canonical names, indices or display names.
+    '''
+    def __iter__(self):
+        query = self.queryset.query
+        encoders = [(name, _encoder(field, query.enum_format))
+                    for name, field in _selected_enum_fields(self.queryset)]
+
+        for row in super(EnumValuesIterable, self).__iter__():
+            for name, encode in encoders:
+                row[name] = encode(row[name])
+            yield row
+
+
+class RichEnumQuerySetMixin(object):
+    '''QuerySet mixin adding enum-aware helpers.
+
+    Combine with models.QuerySet (or a subclass of it).
+    '''
+    def enum_raw(self, *field_names):
+        '''Return stored values (ints or canonical names) for enum fields,
+        instead of converting them to enum values.
+
+        Applies to the named fields (which may follow relations, as in
+        'parent__my_enum'), or to every enum field if none are given.
+        '''
+        fields = [_get_enum_field(self.model, name) for name in field_names]
+
+        clone = self._chain()
+        if not isinstance(clone.query, RichEnumQuery):
+            clone.query = clone.query.chain(RichEnumQuery)
+        clone.query.enum_raw_fields = frozenset(fields)
+        return clone
+
+    def enum_values(self, *fields, enum_format='canonical_name', **expressions):
+        '''Like values(), but with enum fields as their canonical
+        names (or indices, or display names, depending on enum_format), ready
+        to be JSON encoded.
+
+        Stored values are mapped straight to the output, without building enum
+        values.
+        '''
+        if enum_format not in ENUM_FORMATS:
+            raise ValueError('enum_format must be one of: %s.' % ', '.join(ENUM_FORMATS))
+
+        clone = self.values(*fields, **expressions)
+        enum_fields = _selected_enum_fields(clone)
+        if enum_format == 'index':
+            for _, field in enum_fields:
+                if not hasattr(field.enum, 'from_index'):
+                    raise TypeError("%s doesn't support index-based lookup." % field.enum)
+        if enum_fields:
+            clone = clone.enum_raw(*[name for name, _ in enum_fields])
+        clone.query.enum_format = enum_format
+        clone._iterable_class = EnumValuesIterable
+        return clone
+
+    def enum_array(self, field_name, chunk_size=2000, null_value=-1, numpy=False):
+        '''Load an IndexEnumField column into a compact array of indices.
+
+        Rows are streamed with iterator(), so no model instances or enum values
+        are built. Returns an EnumColumn of the indices and a decode table;
+        NULLs are stored as null_value (the array's type is picked to fit it).
+        Pass numpy=True to get a numpy array (sharing the same buffer) instead.
+        '''
+        field = self.model._meta.get_field(field_name)
+        if not isinstance(field, IndexEnumField):
+            raise TypeError('%s is not an IndexEnumField.' % field_name)
+
+        by_index = get_lookup_table(field.enum).by_index
+        max_index = max(by_index) if by_index else 0
+        # The smallest signed type that holds every index (and null_value).
+        low, high = 0, max_index
+        if field.null:
+            low, high = min(low, null_value), max(high, null_value)
+        for typecode, bits in (('h', 16), ('i', 32), ('q', 64)):
+            if -2 ** (bits - 1) <= low and high < 2 ** (bits - 1):
+                break
+        else:
+            raise ValueError('null_value %d does not fit in a 64-bit integer array.' % null_value)
+        decode = tuple(by_index.get(i) for i in range(max_index + 1)) + (None,)
+
+        stored = self.enum_raw(field_name).values_list(field_name, flat=True).iterator(chunk_size=chunk_size)
+        if field.null:
+            stored = (null_value if value is None else value for value in stored)
+        values = array(typecode, stored)
+
+        if numpy:
+            # numpy is optional, so only import it when asked for
+            import numpy as np  # pylint: disable=import-error
+            values = np.frombuffer(values, dtype=typecode)
+        return EnumColumn(values, decode)
+
+    def enum_counts(self, *field_names):
+        '''Count rows per enum value with a single GROUP BY query.
+
+        With one field, returns a dict of {enum value: count} covering every
+        member of the enum in order (zero if there are no rows), followed by
+        None if the column has NULLs. With several fields, returns a cross-tab
+        keyed by tuples of enum values covering every combination of members.
+        '''
+        if not field_names:
+            raise TypeError('enum_counts() requires at least one field name.')
+        fields = [_get_enum_field(self.model, name) for name in field_names]
+        decoders = [_decoder(field) for field in fields]
+
+        counts = dict.fromkeys(itertools.product(*[field.enum.members() for field in fields]), 0)
+        rows = self.enum_raw(*field_names).order_by().values_list(*field_names).annotate(
+            _enum_count=Count('*'))
+        for row in rows:
+            key = tuple(None if value is None else decode(value)
+                        for decode, value in zip(decoders, row[:-1]))
+            counts[key] = row[-1]
+
+        if len(fields) == 1:
+            return dict((key[0], count) for key, count in counts.items())
+        return counts
+
+
+class RichEnumQuerySet(RichEnumQuerySetMixin, models.QuerySet):
+    pass
+
+
+class RichEnumManager(models.Manager.from_queryset(RichEnumQuerySet)):
+    pass
@@ -3,8 +3,15 @@ from django.db import models
 from django_richenum.models import IndexEnumField
 from django_richenum.models import LaxIndexEnumField
 from django_richenum.models import CanonicalNameEnumField
+from django_richenum.models import EnumCheckConstraint
+from django_richenum.models import EnumPartialIndex
+from django_richenum.models import EnumPickleMixin
+from django_richenum.models import EnumSetField
+from django_richenum.models import MultipleCanonicalNameEnumField
+from django_richenum.models import SmallIndexEnumField
+from django_richenum.models import RichEnumManager
 
-from .constants import Number
+from .constants import Fruit, Number
 
 
 def default_num():
@@ -20,3 +27,30 @@ class NumNode(models.Model):
     parent = models.ForeignKey('self', null=True, on_delete=models.CASCADE)
     num_callable_default = IndexEnumField(Number, default=default_num)
     num_str_callable_default = CanonicalNameEnumField(Number, default=default_num, max_length=5)
+    num_lazy = IndexEnumField(Number, default=Number.ONE, lazy=True)
+    num_str_lazy = CanonicalNameEnumField(Number, default=Number.ONE, max_length=5, lazy=True)
+    fruit = CanonicalNameEnumField(Fruit, default=Fruit.APPLE, max_length=5)
+    num_small = SmallIndexEnumField(Number, default=Number.ONE)
+    fruit_auto = CanonicalNameEnumField(Fruit, default=Fruit.APPLE)
+    nums = EnumSetField(Number, default=frozenset, blank=True)
+    fruits = MultipleCanonicalNameEnumField(Fruit, default=tuple, blank=True)
+
+    objects = RichEnumManager()
+
+    class Meta:
+        constraints = [
+            EnumCheckConstraint(field_name='num_lazy', enum=Number),
+            EnumCheckConstraint(field_name='num_str_lazy', enum=Number, value_field='canonical_name'),
+        ]
+        indexes = [
+            EnumPartialIndex(field_name='num_small', members=[Number.TWO], name='numnode_num_small_two'),
+        ]
+
+
+class PickledNode(EnumPickleMixin, models.Model):
+    num = IndexEnumField(Number, default=Number.ONE)
+    num_nullable = IndexEnumField(Number, null=True)
+    num_lazy = IndexEnumField(Number, default=Number.ONE, lazy=True)
+    fruit = CanonicalNameEnumField(Fruit, default=Fruit.APPLE)
+    nums = EnumSetField(Number, default=frozenset, blank=True)
+    fruits = MultipleCanonicalNameEnumField(Fruit, default=tuple, blank=True)
@@ -0,0 +1,54 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from django_richenum.management.commands.richenum_audit import find_unknown_values
+
+from .constants import Number
+from .models import NumNode
+
+
+def audit(*args):
+    stdout = StringIO()
+    call_command('richenum_audit', *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+class AuditTests(TestCase):
+    def test_no_unknown_values(self):
+        NumNode.objects.create(num=Number.TWO, num_nullable=None)
+        self.assertIn('No unknown enum values.', audit())
+        self.assertIn('tests.NumNode.num: OK', audit('tests', '--verbosity=2'))
+
+    def test_reports_unknown_values(self):
+        NumNode.objects.create()
+        NumNode.objects.create()
+        NumNode.objects.create()
+        NumNode.objects.filter(pk__in=NumNode.objects.order_by('pk').values('pk')[:2]).update(num=7)
+        NumNode.objects.update(num_str='three')
+
+        with self.assertRaises(CommandError) as cm:
+            audit('tests.NumNode')
+        self.assertEqual(cm.exception.returncode, 1)
+        self.assertIn('Found 5 rows', str(cm.exception))
+
+    def test_find_unknown_values(self):
+        NumNode.objects.create()
+        NumNode.objects.create()
+        NumNode.objects.update(num=7, num_str='three', num_lax='one')
+
+        def unknown(name):
+            return find_unknown_values(NumNode, NumNode._meta.get_field(name))  # pylint: disable=E1101
+
+        # Doesn't load rows or convert values.
+        with self.assertNumQueries(1):
+            self.assertEqual(unknown('num'), {7: 2})
+        self.assertEqual(unknown('num_str'), {'three': 2})
+        self.assertEqual(unknown('num_lax'), {})
+        self.assertEqual(unknown('num_nullable'), {})
+
+    def test_unknown_label(self):
+        with self.assertRaises(CommandError):
+            audit('tests.Missing')
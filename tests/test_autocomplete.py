@@ -0,0 +1,83 @@
+import json
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.exceptions import PermissionDenied
+from django.test import RequestFactory
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import resolve
+
+from django_richenum.admin.views import EnumAutocompleteJsonView
+from django_richenum.admin.widgets import EnumAutocompleteSelect
+from django_richenum.forms.widgets import EnumSelect
+
+from .constants import Fruit, Number
+from .models import NumNode
+from .urls import site
+
+URL = '/admin/tests/numnode/enum-autocomplete/'
+
+
+@override_settings(ROOT_URLCONF='tests.urls')
+class EnumAutocompleteTests(TestCase):
+    def setUp(self):
+        self.model_admin = site._registry[NumNode]
+        self.user = User(is_superuser=True, is_staff=True, is_active=True)
+
+    def get_form(self, **kwargs):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        return self.model_admin.get_form(request)(**kwargs)
+
+    def search(self, **params):
+        request = RequestFactory().get(URL, params)
+        request.user = self.user
+        return json.loads(resolve(URL).func(request).content)
+
+    def test_searches_canonical_and_display_names(self):
+        self.assertEqual(self.search(field_name='num', term='d'),
+                         {'results': [{'id': '2', 'text': 'dos'}], 'pagination': {'more': False}})
+        self.assertEqual(self.search(field_name='num', term='ON')['results'], [{'id': '1', 'text': 'uno'}])
+        self.assertEqual(self.search(field_name='fruit', term='mel')['results'],
+                         [{'id': 'peach', 'text': 'melocoton'}])
+        self.assertEqual(self.search(field_name='fruit', term='x')['results'], [])
+
+    def test_paginates(self):
+        with mock.patch.object(EnumAutocompleteJsonView, 'paginate_by', 1):
+            self.assertEqual(self.search(field_name='num'),
+                             {'results': [{'id': '1', 'text': 'uno'}], 'pagination': {'more': True}})
+            self.assertEqual(self.search(field_name='num', page='2'),
+                             {'results': [{'id': '2', 'text': 'dos'}], 'pagination': {'more': False}})
+
+    def test_only_autocomplete_fields(self):
+        with self.assertRaises(PermissionDenied):
+            self.search(field_name='num_str')
+
+    def test_requires_permission(self):
+        self.user = User.objects.create(username='staff', is_staff=True, is_active=True)
+        with self.assertRaises(PermissionDenied):
+            self.search(field_name='num')
+
+    def test_admin_uses_widget(self):
+        form = self.get_form()
+        self.assertIsInstance(form.fields['num'].widget, EnumAutocompleteSelect)
+        self.assertIsInstance(form.fields['fruit'].widget, EnumAutocompleteSelect)
+        self.assertNotIsInstance(form.fields['num_str'].widget, EnumAutocompleteSelect)
+
+    def test_plain_model_admin_keeps_enum_select(self):
+        # formfield_overrides for IntegerField/CharField don't apply to enums.
+        self.model_admin = admin.ModelAdmin(NumNode, admin.AdminSite())
+        form = self.get_form()
+        self.assertIsInstance(form.fields['num'].widget, EnumSelect)
+        self.assertIsInstance(form.fields['num_str'].widget, EnumSelect)
+
+    def test_renders_only_selected_option(self):
+        form = self.get_form(instance=NumNode(num=Number.TWO, fruit=Fruit.PEACH))
+        html = str(form['num'])
+        self.assertIn('data-ajax--url="%s"' % URL, html)
+        self.assertIn('data-field-name="num"', html)
+        self.assertInHTML('<option value="2" selected>dos</option>', html)
+        self.assertNotIn('uno', html)
+        self.assertInHTML('<option value="peach" selected>melocoton</option>', str(form['fruit']))
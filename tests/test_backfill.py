@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.test import TransactionTestCase
+
+from django_richenum.models import backfill_index_from_canonical
+
+from .constants import Number
+from .models import NumNode
+
+
+def create_nodes(*num_strs):
+    # Nodes whose num column still needs to be filled in from num_str.
+    return [NumNode.objects.create(num=Number.ONE, num_str=num_str) for num_str in num_strs]
+
+
+class BackfillTests(TestCase):
+    def test_backfills_index_from_canonical_name(self):
+        create_nodes(Number.TWO, Number.ONE, Number.TWO)
+        self.assertEqual(backfill_index_from_canonical(NumNode, 'num_str', 'num'), 3)
+        self.assertEqual([node.num for node in NumNode.objects.order_by('pk')], [Number.TWO, Number.ONE, Number.TWO])
+
+    def test_batches_and_reports_progress(self):
+        nodes = create_nodes(*[Number.TWO] * 5)
+        reports = []
+        backfill_index_from_canonical(NumNode, 'num_str', 'num', batch_size=2, progress=reports.append)
+
+        first, last = nodes[0].pk, nodes[-1].pk
+        self.assertEqual([report.next_pk for report in reports], [first + 2, first + 4, last + 1])
+        self.assertEqual([report.updated for report in reports], [2, 4, 5])
+        self.assertEqual({report.max_pk for report in reports}, {last})
+
+    def test_resumes_from_start(self):
+        nodes = create_nodes(Number.TWO, Number.TWO, Number.TWO)
+        self.assertEqual(backfill_index_from_canonical(NumNode, 'num_str', 'num', start=nodes[1].pk), 2)
+        self.assertEqual([node.num for node in NumNode.objects.order_by('pk')], [Number.ONE, Number.TWO, Number.TWO])
+        self.assertEqual(backfill_index_from_canonical(NumNode, 'num_str', 'num', start=nodes[-1].pk + 1), 0)
+
+    def test_nothing_to_backfill(self):
+        self.assertEqual(backfill_index_from_canonical(NumNode, 'num_str', 'num'), 0)
+
+    def test_uses_single_update_per_batch(self):
+        create_nodes(Number.TWO, Number.ONE, Number.TWO)
+        # One query for the pk range, then one UPDATE.
+        with self.assertNumQueries(2):
+            backfill_index_from_canonical(NumNode, 'num_str', 'num')
+
+    def test_rejects_non_index_target(self):
+        with self.assertRaises(TypeError):
+            backfill_index_from_canonical(NumNode, 'num', 'num_str')
+
+    def test_rejects_workers_in_transaction(self):
+        # TestCase runs each test inside atomic().
+        create_nodes(Number.TWO)
+        with self.assertRaises(ValueError):
+            backfill_index_from_canonical(NumNode, 'num_str', 'num', workers=2)
+
+
+class ParallelBackfillTests(TransactionTestCase):
+    def test_workers(self):
+        create_nodes(*[Number.TWO] * 7)
+        reports = []
+        updated = backfill_index_from_canonical(NumNode, 'num_str', 'num', batch_size=2, workers=3,
+                                                progress=reports.append)
+        self.assertEqual(updated, 7)
+        self.assertEqual(reports[-1].next_pk, reports[-1].max_pk + 1)
+        self.assertEqual(set(NumNode.objects.values_list('num', flat=True)), {Number.TWO})
+
+
+class BackfillCommandTests(TestCase):
+    def test_command(self):
+        create_nodes(Number.TWO, Number.TWO)
+        stdout = StringIO()
+        call_command('richenum_backfill', 'tests.NumNode', 'num_str', 'num', '--batch-size=1', stdout=stdout)
+        self.assertIn('resume with --start', stdout.getvalue())
+        self.assertIn('Backfilled 2 rows.', stdout.getvalue())
+        self.assertEqual(set(NumNode.objects.values_list('num', flat=True)), {Number.TWO})
+
+    def test_command_errors(self):
+        with self.assertRaises(CommandError):
+            call_command('richenum_backfill', 'tests.Missing', 'num_str', 'num')
+        with self.assertRaises(CommandError):
+            call_command('richenum_backfill', 'tests.NumNode', 'num', 'num_str')
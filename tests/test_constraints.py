@@ -0,0 +1,42 @@
+from django.db import IntegrityError
+from django.db import models
+from django.test import TestCase
+
+from django_richenum.models import EnumCheckConstraint
+
+from .constants import Fruit, Number
+from .models import NumNode
+
+
+class EnumCheckConstraintTests(TestCase):
+    def test_check_lists_stored_values(self):
+        self.assertEqual(EnumCheckConstraint(field_name='num', enum=Number).check, models.Q(num__in=[1, 2]))
+        self.assertEqual(EnumCheckConstraint(field_name='fruit', enum=Fruit).check,
+                         models.Q(fruit__in=['apple', 'peach']))
+        self.assertEqual(
+            EnumCheckConstraint(field_name='num_str', enum=Number, value_field='canonical_name').check,
+            models.Q(num_str__in=['one', 'two']))
+
+    def test_default_name(self):
+        constraint = NumNode._meta.constraints[0]  # pylint: disable=E1101
+        self.assertEqual(constraint.name, 'tests_numnode_num_lazy_enum')
+
+    def test_deconstructs_to_check_constraint(self):
+        constraint = EnumCheckConstraint(field_name='num', enum=Number, name='num_enum')
+        path, args, kwargs = constraint.deconstruct()
+        self.assertEqual(path, 'django.db.models.CheckConstraint')
+        self.assertEqual(args, ())
+        self.assertEqual(kwargs, {'check': models.Q(num__in=[1, 2]), 'name': 'num_enum'})
+
+        clone = constraint.clone()
+        self.assertIs(type(clone), models.CheckConstraint)
+        self.assertEqual(clone, constraint)
+
+    def test_database_rejects_invalid_values(self):
+        NumNode.objects.create()
+        with self.assertRaises(IntegrityError):
+            NumNode.objects.update(num_lazy=3)
+
+    def test_database_rejects_invalid_bulk_create(self):
+        with self.assertRaises(IntegrityError):
+            NumNode.objects.bulk_create([NumNode(num_str_lazy='three')])
@@ -0,0 +1,31 @@
+import datetime
+import json
+from unittest import TestCase
+
+from django_richenum.encoders import RichEnumJSONEncoder
+
+from .constants import Fruit, Number
+
+
+class IndexEncoder(RichEnumJSONEncoder):
+    enum_format = 'index'
+
+
+class DisplayNameEncoder(RichEnumJSONEncoder):
+    enum_format = 'display_name'
+
+
+class RichEnumJSONEncoderTests(TestCase):
+    def test_encodes_canonical_names(self):
+        data = {'num': Number.TWO, 'fruit': Fruit.APPLE, 'nums': frozenset([Number.TWO, Number.ONE])}
+        self.assertEqual(json.loads(json.dumps(data, cls=RichEnumJSONEncoder)),
+                         {'num': 'two', 'fruit': 'apple', 'nums': ['one', 'two']})
+
+    def test_enum_format(self):
+        self.assertEqual(json.dumps([Number.TWO, None], cls=IndexEncoder), '[2, null]')
+        self.assertEqual(json.dumps(Fruit.PEACH, cls=DisplayNameEncoder), '"melocoton"')
+
+    def test_falls_back_to_django_encoder(self):
+        self.assertEqual(json.dumps(datetime.date(2020, 1, 2), cls=RichEnumJSONEncoder), '"2020-01-02"')
+        with self.assertRaises(TypeError):
+            json.dumps(object(), cls=RichEnumJSONEncoder)
@@ -0,0 +1,89 @@
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core import checks
+from django.test import RequestFactory
+from django.test import TestCase
+from richenum import EnumLookupError
+from richenum import OrderedRichEnum
+from richenum import OrderedRichEnumValue
+
+from django_richenum.forms.widgets import EnumSelectMultiple
+from django_richenum.models import EnumSetField
+
+from .constants import Fruit, Number
+from .models import NumNode
+
+
+class _Wide(OrderedRichEnumValue):
+    pass
+
+
+class Wide(OrderedRichEnum):
+    LOW = _Wide(0, 'low', 'Low')
+    HIGH = _Wide(63, 'high', 'High')
+
+
+class EnumSetFieldTests(TestCase):
+    def test_default(self):
+        self.assertEqual(NumNode().nums, frozenset())
+
+    def test_assignment_converts_to_frozenset(self):
+        instance = NumNode()
+        instance.nums = [Number.ONE, 2]
+        self.assertEqual(instance.nums, frozenset([Number.ONE, Number.TWO]))
+        instance.nums = Number.TWO
+        self.assertEqual(instance.nums, frozenset([Number.TWO]))
+        instance.nums = 0b110
+        self.assertEqual(instance.nums, frozenset([Number.ONE, Number.TWO]))
+
+    def test_stores_bitmask(self):
+        NumNode.objects.create(nums={Number.ONE, Number.TWO})
+        self.assertEqual(NumNode.objects.filter(nums=0b110).count(), 1)
+        self.assertEqual(NumNode.objects.get().nums, frozenset([Number.ONE, Number.TWO]))
+
+    def test_unknown_bits(self):
+        with self.assertRaises(EnumLookupError):
+            NumNode(nums=0b1)
+
+    def test_rejects_other_types(self):
+        with self.assertRaises(TypeError):
+            NumNode(nums='one')
+        with self.assertRaises(TypeError):
+            NumNode(nums=[Fruit.APPLE])
+
+    def test_has_any(self):
+        NumNode.objects.create(nums=[Number.ONE])
+        NumNode.objects.create(nums=[Number.ONE, Number.TWO])
+        NumNode.objects.create()
+        self.assertEqual(NumNode.objects.filter(nums__has_any=Number.TWO).count(), 1)
+        self.assertEqual(NumNode.objects.filter(nums__has_any=[Number.ONE, Number.TWO]).count(), 2)
+        self.assertIn('&', str(NumNode.objects.filter(nums__has_any=Number.TWO).query))
+
+    def test_has_all(self):
+        NumNode.objects.create(nums=[Number.ONE])
+        NumNode.objects.create(nums=[Number.ONE, Number.TWO])
+        self.assertEqual(NumNode.objects.filter(nums__has_all=[Number.ONE, Number.TWO]).count(), 1)
+        self.assertEqual(NumNode.objects.filter(nums__has_all=Number.ONE).count(), 2)
+
+    def test_full_clean(self):
+        NumNode(nums=[Number.ONE]).full_clean(exclude=['parent'])
+
+    def test_plain_model_admin_form(self):
+        # formfield_overrides for BigIntegerField don't apply to enum sets.
+        request = RequestFactory().get('/')
+        request.user = User(is_superuser=True, is_staff=True, is_active=True)
+        form_class = admin.ModelAdmin(NumNode, admin.AdminSite()).get_form(request, fields=['nums'])
+        self.assertIsInstance(form_class.base_fields['nums'].widget, EnumSelectMultiple)
+        form = form_class({'nums': ['1', '2']})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(set(form.cleaned_data['nums']), {Number.ONE, Number.TWO})
+
+    def test_requires_ordered_enum(self):
+        with self.assertRaises(TypeError):
+            EnumSetField(Fruit)
+
+    def test_check_index_range(self):
+        field = EnumSetField(Wide)
+        field.set_attributes_from_name('wide')
+        errors = [error for error in field.check() if isinstance(error, checks.Error)]
+        self.assertEqual([error.id for error in errors], ['django_richenum.E001'])
@@ -0,0 +1,52 @@
+from django.db.models import Count
+from django.test import TestCase
+
+from django_richenum.models import EnumDisplay
+from django_richenum.models import EnumOrder
+from django_richenum.models.expressions import _EnumCase
+
+from .constants import Fruit, Number
+from .models import NumNode
+
+
+class EnumExpressionTests(TestCase):
+    def setUp(self):
+        first = NumNode.objects.create(num=Number.ONE, num_str=Number.TWO, fruit=Fruit.PEACH)
+        NumNode.objects.create(num=Number.TWO, num_str=Number.ONE, parent=first)
+        NumNode.objects.create(num=Number.TWO, num_str=Number.ONE)
+
+    def test_annotate_display(self):
+        values = NumNode.objects.annotate(
+            display=EnumDisplay('num'), str_display=EnumDisplay('num_str')).order_by('pk')
+        self.assertEqual(
+            list(values.values_list('display', 'str_display')),
+            [('uno', 'dos'), ('dos', 'uno'), ('dos', 'uno')])
+
+    def test_order_by_display(self):
+        # 'dos' < 'uno', which is the reverse of the index order
+        nums = NumNode.objects.order_by(EnumDisplay('num'), 'pk').values_list('num', flat=True)
+        self.assertEqual(list(nums), [Number.TWO, Number.TWO, Number.ONE])
+
+    def test_order_by_enum_order(self):
+        nums = NumNode.objects.order_by(EnumOrder('num_str').desc(), 'pk').values_list('num_str', flat=True)
+        self.assertEqual(list(nums), [Number.TWO, Number.ONE, Number.ONE])
+
+    def test_group_by_display(self):
+        counts = NumNode.objects.values(display=EnumDisplay('fruit')).annotate(n=Count('pk')).order_by('display')
+        self.assertEqual(list(counts), [{'display': 'manzana', 'n': 2}, {'display': 'melocoton', 'n': 1}])
+
+    def test_related_field(self):
+        values = NumNode.objects.filter(parent__isnull=False).annotate(display=EnumDisplay('parent__num'))
+        self.assertEqual(list(values.values_list('display', flat=True)), ['uno'])
+
+    def test_rejects_non_enum_fields(self):
+        with self.assertRaises(TypeError):
+            list(NumNode.objects.annotate(display=EnumDisplay('parent')))
+
+    def test_hooks_are_abstract(self):
+        class Incomplete(_EnumCase):
+            def get_output_field(self):
+                return None
+
+        with self.assertRaises(TypeError):
+            Incomplete('num')  # pylint: disable=abstract-class-instantiated
@@ -1,5 +1,6 @@
 from django import forms
 from unittest import TestCase
+from unittest import mock
 
 from django_richenum.forms import CanonicalEnumField
 from django_richenum.forms import IndexEnumField
@@ -217,3 +218,61 @@ class MultiIndexFormTests(TestCase):
         choices = Number.choices()
         with self.assertRaises(ValueError):
             MultipleIndexEnumField(Number, choices=choices)
+
+
+class SharedChoicesTests(TestCase):
+
+    def test_fields_share_choices(self):
+        self.assertIs(CanonicalEnumField(Fruit).choices, MultipleCanonicalEnumField(Fruit).choices)
+        self.assertIs(IndexEnumField(Number).choices, MultipleIndexEnumField(Number).choices)
+        self.assertIsNot(IndexEnumField(Number).choices, CanonicalEnumField(Number).choices)
+        self.assertEqual(CanonicalEnumField(Fruit).choices, (('apple', 'manzana'), ('peach', 'melocoton')))
+
+    def test_widget_shares_choices(self):
+        field = IndexEnumField(Number)
+        self.assertIs(field.widget.choices, field.choices)
+
+    def test_formset_shares_choices(self):
+        class EnumForm(forms.Form):
+            num = IndexEnumField(Number)
+            num_str = CanonicalEnumField(Number)
+            fruits = MultipleCanonicalEnumField(Fruit)
+
+        formset = forms.formset_factory(EnumForm, extra=500)()
+        for name in ('num', 'num_str', 'fruits'):
+            choices = set(id(form.fields[name].choices) for form in formset.forms)
+            self.assertEqual(len(choices), 1)
+            self.assertEqual(choices, set(id(form.fields[name].widget.choices) for form in formset.forms))
+        self.assertIs(formset.forms[0].fields['num_str'].choices, CanonicalEnumField(Number).choices)
+
+
+class ValidationTests(TestCase):
+
+    def test_invalid_choice(self):
+        for field, value in ((IndexEnumField(Number), '3'), (IndexEnumField(Number), 'one'),
+                             (CanonicalEnumField(Fruit), 'pear'), (MultipleIndexEnumField(Number), ['1', '3'])):
+            with self.assertRaises(forms.ValidationError) as cm:
+                field.clean(value)
+            self.assertEqual(cm.exception.code, 'invalid_choice')
+
+    def test_valid_value(self):
+        field = IndexEnumField(Number)
+        self.assertTrue(field.valid_value('2'))
+        self.assertTrue(field.valid_value(2))
+        self.assertTrue(field.valid_value(Number.TWO))
+        self.assertFalse(field.valid_value('3'))
+        self.assertFalse(field.valid_value(Fruit.APPLE))
+        field = CanonicalEnumField(Fruit)
+        self.assertTrue(field.valid_value('apple'))
+        self.assertTrue(field.valid_value(Fruit.APPLE))
+        self.assertFalse(field.valid_value(Number.ONE))
+
+    def test_clean_uses_lookup_table(self):
+        field = MultipleIndexEnumField(Number)
+        with mock.patch.object(Number, 'from_index', side_effect=AssertionError):
+            self.assertEqual(field.clean(['2', '1'] * 1000), [Number.TWO, Number.ONE] * 1000)
+
+    def test_multiple_canonical(self):
+        field = MultipleCanonicalEnumField(Fruit, required=False)
+        self.assertEqual(field.clean(['peach', 'apple']), [Fruit.PEACH, Fruit.APPLE])
+        self.assertEqual(field.clean([]), [])
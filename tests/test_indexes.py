@@ -0,0 +1,50 @@
+from django.db import connection
+from django.db import models
+from django.test import TestCase
+
+from django_richenum.models import EnumPartialIndex
+
+from .constants import Fruit, Number
+from .models import NumNode
+
+
+class EnumPartialIndexTests(TestCase):
+    def test_condition_uses_stored_values(self):
+        index = EnumPartialIndex(field_name='num', members=[Number.ONE, Number.TWO], name='num_idx')
+        self.assertEqual(index.condition, models.Q(num__in=[1, 2]))
+        self.assertEqual(index.fields, ['num'])
+
+        index = EnumPartialIndex(field_name='fruit', members=[Fruit.PEACH], name='fruit_idx')
+        self.assertEqual(index.condition, models.Q(fruit='peach'))
+
+        index = EnumPartialIndex(field_name='num_str', members=[Number.TWO], name='num_str_idx',
+                                 value_field='canonical_name')
+        self.assertEqual(index.condition, models.Q(num_str='two'))
+
+    def test_other_fields(self):
+        index = EnumPartialIndex(field_name='num', members=[Number.TWO], name='num_idx', fields=['-id'])
+        self.assertEqual(index.fields, ['-id'])
+        self.assertEqual(index.condition, models.Q(num=2))
+
+    def test_requires_members(self):
+        with self.assertRaises(ValueError):
+            EnumPartialIndex(field_name='num', members=[], name='num_idx')
+
+    def test_deconstructs_to_index(self):
+        index = EnumPartialIndex(field_name='num', members=[Number.TWO], name='num_idx')
+        path, args, kwargs = index.deconstruct()
+        self.assertEqual(path, 'django.db.models.Index')
+        self.assertEqual(args, ())
+        self.assertEqual(kwargs, {'fields': ['num'], 'name': 'num_idx', 'condition': models.Q(num=2)})
+
+        clone = index.clone()
+        self.assertIs(type(clone), models.Index)
+        self.assertEqual(clone.deconstruct(), index.deconstruct())
+
+    def test_creates_partial_index(self):
+        table = NumNode._meta.db_table  # pylint: disable=E1101
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table)
+        self.assertEqual(constraints['numnode_num_small_two']['columns'], ['num_small'])
+        index = NumNode._meta.indexes[0]  # pylint: disable=E1101
+        self.assertIn('WHERE', str(index.create_sql(NumNode, connection.schema_editor())))
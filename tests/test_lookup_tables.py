@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from richenum import EnumLookupError
+
+from django_richenum.lookup_tables import PrefixIndex
+from django_richenum.lookup_tables import clear_lookup_tables
+from django_richenum.lookup_tables import get_lookup_table
+
+from .constants import Fruit, Number
+
+
+class LookupTableTests(TestCase):
+
+    def tearDown(self):
+        clear_lookup_tables()
+
+    def test_table_is_cached_per_enum(self):
+        self.assertIs(get_lookup_table(Number), get_lookup_table(Number))
+        self.assertIsNot(get_lookup_table(Number), get_lookup_table(Fruit))
+
+    def test_from_index(self):
+        self.assertEqual(get_lookup_table(Number).from_index(2), Number.TWO)
+
+    def test_from_index_string(self):
+        table = get_lookup_table(Number)
+        self.assertEqual(table.from_index_string('2'), Number.TWO)
+        self.assertEqual(table.from_index_string(' 2'), Number.TWO)
+        with self.assertRaises(ValueError):
+            table.from_index_string('two')
+
+    def test_from_canonical(self):
+        self.assertEqual(get_lookup_table(Fruit).from_canonical('peach'), Fruit.PEACH)
+        self.assertEqual(get_lookup_table(Number).from_canonical('one'), Number.ONE)
+
+    def test_unknown_values_raise_enum_lookup_error(self):
+        with self.assertRaises(EnumLookupError):
+            get_lookup_table(Number).from_index(3)
+        with self.assertRaises(EnumLookupError):
+            get_lookup_table(Fruit).from_canonical('pear')
+
+    def test_search(self):
+        table = get_lookup_table(Fruit)
+        self.assertEqual(table.search(''), [Fruit.APPLE, Fruit.PEACH])
+        self.assertEqual(table.search('Pea'), [Fruit.PEACH])
+        self.assertEqual(table.search('man'), [Fruit.APPLE])
+        self.assertEqual(table.search('pear'), [])
+
+    def test_search_matches_words_of_display_names(self):
+        index = PrefixIndex([Number.ONE, Number.TWO])
+        self.assertEqual(index.search('o'), [Number.ONE])
+        index.keys.append('zzz')
+        index.positions.append(1)
+        self.assertEqual(index.search('zz'), [Number.TWO])
+
+    def test_unordered_enums_have_no_index_table(self):
+        self.assertIsNone(get_lookup_table(Fruit).by_index)
+
+    def test_clear_lookup_tables(self):
+        table = get_lookup_table(Number)
+        clear_lookup_tables(Number)
+        self.assertIsNot(get_lookup_table(Number), table)
+
+        table = get_lookup_table(Fruit)
+        clear_lookup_tables()
+        self.assertIsNot(get_lookup_table(Fruit), table)
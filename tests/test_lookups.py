@@ -0,0 +1,108 @@
+from django.db.models import F
+from django.db.models.expressions import Col
+from django.test import TestCase
+from richenum import OrderedRichEnum
+from richenum import OrderedRichEnumValue
+
+from django_richenum.models import CanonicalNameEnumField
+from django_richenum.models.lookups import _CanonicalNameOrdering
+
+from .constants import Fruit, Number
+from .models import NumNode
+
+
+class IndexEnumFieldLookupTests(TestCase):
+    def setUp(self):
+        NumNode.objects.create(num=Number.ONE)
+        NumNode.objects.create(num=Number.TWO)
+
+    def test_comparisons_with_enum_values(self):
+        self.assertEqual(NumNode.objects.filter(num__gt=Number.ONE).get().num, Number.TWO)
+        self.assertEqual(NumNode.objects.filter(num__gte=Number.ONE).count(), 2)
+        self.assertEqual(NumNode.objects.filter(num__lt=Number.TWO).get().num, Number.ONE)
+        self.assertEqual(NumNode.objects.filter(num__lte=Number.ONE).get().num, Number.ONE)
+
+    def test_comparisons_use_column(self):
+        self.assertIn('"num" >= 2', str(NumNode.objects.filter(num__gte=Number.TWO).query))
+
+    def test_between(self):
+        query = NumNode.objects.filter(num__between=(Number.ONE, Number.TWO)).query
+        self.assertIn('BETWEEN 1 AND 2', str(query))
+        self.assertEqual(NumNode.objects.filter(num__between=(Number.ONE, Number.TWO)).count(), 2)
+        self.assertEqual(NumNode.objects.filter(num__between=(Number.TWO, Number.TWO)).count(), 1)
+
+
+class _Reversed(OrderedRichEnumValue):
+    pass
+
+
+class Reversed(OrderedRichEnum):
+    # Canonical names sort in the opposite order to the indices.
+    ZZZ = _Reversed(1, 'zzz', 'Z')
+    MMM = _Reversed(2, 'mmm', 'M')
+    AAA = _Reversed(3, 'aaa', 'A')
+
+
+class CanonicalNameEnumFieldLookupTests(TestCase):
+    def setUp(self):
+        NumNode.objects.create(num_str=Number.ONE, fruit=Fruit.APPLE)
+        NumNode.objects.create(num_str=Number.TWO, fruit=Fruit.PEACH)
+
+    def test_comparisons_use_enum_order(self):
+        self.assertEqual(NumNode.objects.filter(num_str__gt=Number.ONE).get().num_str, Number.TWO)
+        self.assertEqual(NumNode.objects.filter(num_str__gte=Number.ONE).count(), 2)
+        self.assertEqual(NumNode.objects.filter(num_str__lt=Number.TWO).get().num_str, Number.ONE)
+        self.assertEqual(NumNode.objects.filter(num_str__lte='one').get().num_str, Number.ONE)
+        self.assertEqual(NumNode.objects.filter(fruit__gt=Fruit.APPLE).get().fruit, Fruit.PEACH)
+
+    def test_comparisons_translate_to_in(self):
+        query = str(NumNode.objects.filter(num_str__gte=Number.TWO).query)
+        self.assertIn('"num_str" IN (two)', query)
+
+    def test_comparison_follows_index_not_name(self):
+        field = CanonicalNameEnumField(Reversed, max_length=3)
+        lookup = field.get_lookup('gt')(Col('t', field), Reversed.ZZZ)
+        self.assertEqual(sorted(lookup.rhs), ['aaa', 'mmm'])
+
+    def test_no_qualifying_members(self):
+        self.assertEqual(NumNode.objects.filter(num_str__gt=Number.TWO).count(), 0)
+
+    def test_between(self):
+        self.assertEqual(NumNode.objects.filter(num_str__between=(Number.ONE, Number.TWO)).count(), 2)
+        self.assertEqual(NumNode.objects.filter(num_str__between=('two', 'two')).count(), 1)
+
+    def test_rejects_expressions(self):
+        with self.assertRaises(TypeError):
+            NumNode.objects.filter(num_str__gt=F('fruit'))
+
+    def test_get_predicate_is_abstract(self):
+        class Incomplete(_CanonicalNameOrdering):
+            lookup_name = 'incomplete'
+
+        with self.assertRaises(TypeError):
+            Incomplete(F('num_str'), [])  # pylint: disable=abstract-class-instantiated
+
+
+class EnumInTests(TestCase):
+    def setUp(self):
+        NumNode.objects.create(num=Number.ONE, num_str=Number.ONE)
+        NumNode.objects.create(num=Number.TWO, num_str=Number.TWO)
+
+    def test_large_in_lists_are_deduplicated(self):
+        qs = NumNode.objects.filter(num__in=[Number.ONE, 1, Number.TWO] * 5000,
+                                    num_str__in=[Number.ONE, 'one'] * 5000)
+        _, params = qs.query.sql_with_params()
+        self.assertEqual(sorted(params, key=str), [1, 2, 'one'])
+        self.assertEqual(qs.count(), 1)
+
+    def test_mixed_values(self):
+        self.assertEqual(NumNode.objects.filter(num__in=[Number.ONE, 2]).count(), 2)
+        self.assertEqual(NumNode.objects.filter(num_str__in=[Number.ONE, 'two']).count(), 2)
+        self.assertEqual(NumNode.objects.filter(num_lax__in=['one', 1]).count(), 2)
+
+    def test_iterators(self):
+        self.assertEqual(NumNode.objects.filter(num__in=iter([Number.TWO])).count(), 1)
+
+    def test_subqueries(self):
+        subquery = NumNode.objects.filter(num=Number.TWO).values('num')
+        self.assertEqual(NumNode.objects.filter(num__in=subquery).count(), 1)
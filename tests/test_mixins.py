@@ -0,0 +1,43 @@
+import pickle
+
+from django.test import TestCase
+
+from .constants import Fruit, Number
+from .models import NumNode
+from .models import PickledNode
+
+
+class EnumPickleMixinTests(TestCase):
+    def test_round_trip(self):
+        node = PickledNode.objects.create(num=Number.TWO, fruit=Fruit.PEACH, nums=[Number.ONE], fruits=[Fruit.APPLE])
+        unpickled = pickle.loads(pickle.dumps(node))
+        self.assertEqual(unpickled.pk, node.pk)
+        self.assertIs(unpickled.num, Number.TWO)
+        self.assertIsNone(unpickled.num_nullable)
+        self.assertIs(unpickled.fruit, Fruit.PEACH)
+        self.assertEqual(unpickled.nums, frozenset([Number.ONE]))
+        self.assertEqual(unpickled.fruits, (Fruit.APPLE,))
+        unpickled.save()
+
+    def test_lazy_fields_stay_raw(self):
+        unpickled = pickle.loads(pickle.dumps(PickledNode(num_lazy=Number.TWO)))
+        self.assertEqual(unpickled.__dict__['num_lazy'], 2)
+        self.assertIs(unpickled.num_lazy, Number.TWO)
+
+    def test_pickles_stored_values(self):
+        state = PickledNode(num=Number.TWO, fruit=Fruit.PEACH).__getstate__()
+        self.assertEqual(state['num'], 2)
+        self.assertEqual(state['fruit'], 'peach')
+        self.assertEqual(state['nums'], 0)
+        self.assertEqual(state['fruits'], [])
+        # The instance itself is unchanged.
+        self.assertEqual(PickledNode(num=Number.TWO).__getstate__()['num'], 2)
+
+    def test_deferred_fields(self):
+        PickledNode.objects.create(num=Number.TWO)
+        unpickled = pickle.loads(pickle.dumps(PickledNode.objects.only('num').get()))
+        self.assertIs(unpickled.num, Number.TWO)
+        self.assertEqual(unpickled.get_deferred_fields(), {'num_nullable', 'num_lazy', 'fruit', 'nums', 'fruits'})
+
+    def test_smaller_than_without_mixin(self):
+        self.assertLess(len(pickle.dumps(PickledNode())), len(pickle.dumps(NumNode())))
@@ -1,10 +1,237 @@
 from django.contrib import admin
+from django.contrib.auth.models import User
+from django.test import RequestFactory
 from django.test import TestCase
+from django.test import override_settings
 
+from .constants import Fruit, Number
 from .models import NumNode
 from django_richenum.admin import RichEnumModelAdmin
+from django_richenum.admin.filters import RichEnumFieldListFilter
+from django_richenum.admin.filters import RichEnumFieldMultipleListFilter
+from django_richenum.admin.filters import get_filter_form_class
 
 
 class ModelAdminTests(TestCase):
     def test_register(self):
         admin.site.register(NumNode, RichEnumModelAdmin)
+
+
+class CountingFilter(RichEnumFieldListFilter):
+    show_counts = True
+
+
+class HidingFilter(RichEnumFieldListFilter):
+    hide_empty = True
+
+
+class CachingFilter(RichEnumFieldListFilter):
+    show_counts = True
+    counts_cache_timeout = 60
+
+
+class CountingMultipleFilter(RichEnumFieldMultipleListFilter):
+    show_counts = True
+    hide_empty = True
+
+
+class ListFilterTestCase(TestCase):
+    list_filter = ()
+
+    admin_attrs = {}
+
+    def setUp(self):
+        NumNode.objects.create(num=Number.TWO, num_str=Number.ONE)
+        NumNode.objects.create(num=Number.TWO, num_str=Number.TWO)
+        self.site = admin.AdminSite()
+        attrs = dict(self.admin_attrs, list_filter=self.list_filter)
+        self.model_admin = type('NumNodeAdmin', (RichEnumModelAdmin, ), attrs)(NumNode, self.site)
+
+    def get_changelist(self, params=None):
+        request = RequestFactory().get('/', params or {})
+        request.user = User(is_superuser=True, is_staff=True, is_active=True)
+        return self.model_admin.get_changelist_instance(request)
+
+    def get_choices(self, params=None, changelist=None):
+        changelist = changelist or self.get_changelist(params)
+        return [
+            [choice['display'] for choice in spec.choices(changelist)]
+            for spec in changelist.filter_specs
+        ]
+
+
+class RichEnumFieldListFilterTests(ListFilterTestCase):
+    list_filter = (('num', RichEnumFieldListFilter), )
+
+    def test_choices_without_counts(self):
+        self.assertEqual(self.get_choices(), [['All', 'uno', 'dos']])
+
+    def test_filters_queryset(self):
+        self.assertEqual(self.get_changelist({'num': '2'}).queryset.count(), 2)
+        self.assertEqual(self.get_changelist({'num': '1'}).queryset.count(), 0)
+
+    def test_ignores_invalid_values(self):
+        self.assertEqual(self.get_changelist({'num': '3'}).queryset.count(), 2)
+        self.assertEqual(self.get_changelist({'num': 'two'}).queryset.count(), 2)
+
+    def test_form_class_is_cached(self):
+        form_cls = get_filter_form_class(Number, 'num')
+        self.assertIs(get_filter_form_class(Number, 'num'), form_cls)
+        self.assertIsNot(get_filter_form_class(Number, 'num_str'), form_cls)
+        self.assertIs(self.get_changelist().filter_specs[0].form_cls, form_cls)
+
+
+class CanonicalNameListFilterTests(ListFilterTestCase):
+    list_filter = (('fruit', RichEnumFieldListFilter), )
+
+    def setUp(self):
+        super(CanonicalNameListFilterTests, self).setUp()
+        NumNode.objects.create(fruit=Fruit.PEACH)
+
+    def test_filters_by_canonical_name(self):
+        self.assertEqual(self.get_changelist({'fruit': 'peach'}).queryset.count(), 1)
+        self.assertEqual(self.get_changelist({'fruit': 'apple'}).queryset.count(), 2)
+        self.assertEqual(self.get_changelist({'fruit': 'pear'}).queryset.count(), 3)
+
+
+class CountingFilterTests(ListFilterTestCase):
+    list_filter = (('num', CountingFilter), ('num_str', CountingFilter))
+
+    def test_counts(self):
+        changelist = self.get_changelist()
+        # One GROUP BY query per filter
+        with self.assertNumQueries(2):
+            choices = self.get_choices(changelist=changelist)
+        self.assertEqual(choices, [['All', 'uno (0)', 'dos (2)'], ['All', 'uno (1)', 'dos (1)']])
+
+    def test_counts_follow_other_filters(self):
+        choices = self.get_choices({'num_str': '1'})
+        self.assertEqual(choices, [['All', 'uno (0)', 'dos (1)'], ['All', 'uno (1)', 'dos (1)']])
+
+    def test_counts_ignore_own_selection(self):
+        NumNode.objects.create(num=Number.ONE, num_str=Number.ONE)
+        choices = self.get_choices({'num': '1'})
+        self.assertEqual(choices, [['All', 'uno (1)', 'dos (2)'], ['All', 'uno (1)', 'dos (0)']])
+
+    def test_counts_follow_search(self):
+        self.model_admin.search_fields = ['num_str']
+        choices = self.get_choices({'q': 'one', 'num': '2'})
+        self.assertEqual(choices, [['All', 'uno (0)', 'dos (1)'], ['All', 'uno (1)', 'dos (0)']])
+
+
+class LazyFieldCountingFilterTests(ListFilterTestCase):
+    list_filter = (('num_lazy', CountingFilter), ('num_str_lazy', CountingMultipleFilter))
+
+    def setUp(self):
+        super(LazyFieldCountingFilterTests, self).setUp()
+        NumNode.objects.create(num_lazy=Number.TWO, num_str_lazy=Number.TWO)
+
+    def test_counts(self):
+        choices = self.get_choices({'num_lazy': '2'})
+        self.assertEqual(choices, [['All', 'uno (2)', 'dos (1)'], ['All', 'dos (1)', 'Exclude selected']])
+
+
+class HidingFilterTests(ListFilterTestCase):
+    list_filter = (('num', HidingFilter), )
+
+    def test_hides_empty_choices(self):
+        self.assertEqual(self.get_choices(), [['All', 'dos (2)']])
+
+    def test_keeps_selected_choice(self):
+        self.assertEqual(self.get_choices({'num': '1'}), [['All', 'uno (0)', 'dos (2)']])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CachingFilterTests(ListFilterTestCase):
+    list_filter = (('num', CachingFilter), ('num_str', RichEnumFieldListFilter))
+
+    def test_caches_counts(self):
+        self.assertEqual(self.get_choices()[0], ['All', 'uno (0)', 'dos (2)'])
+        NumNode.objects.create(num=Number.ONE)
+        self.assertEqual(self.get_choices()[0], ['All', 'uno (0)', 'dos (2)'])
+
+    def test_cache_is_keyed_by_query(self):
+        self.assertEqual(self.get_choices()[0], ['All', 'uno (0)', 'dos (2)'])
+        self.assertEqual(self.get_choices({'num_str': '1'})[0], ['All', 'uno (0)', 'dos (1)'])
+
+
+class MultipleListFilterTests(ListFilterTestCase):
+    list_filter = (('num', RichEnumFieldMultipleListFilter), ('fruit', RichEnumFieldMultipleListFilter))
+
+    def setUp(self):
+        super(MultipleListFilterTests, self).setUp()
+        NumNode.objects.create(num=Number.ONE, fruit=Fruit.PEACH)
+
+    def test_no_selection(self):
+        changelist = self.get_changelist()
+        self.assertEqual(changelist.queryset.count(), 3)
+        self.assertEqual(self.get_choices(changelist=changelist)[0], ['All', 'uno', 'dos', 'Exclude selected'])
+
+    def test_selection_uses_index_bits(self):
+        # Bit 1 is Number.ONE, bit 2 is Number.TWO
+        self.assertEqual(self.get_changelist({'num__enum_mask': '2'}).queryset.count(), 1)
+        self.assertEqual(self.get_changelist({'num__enum_mask': '4'}).queryset.count(), 2)
+        self.assertEqual(self.get_changelist({'num__enum_mask': '6'}).queryset.count(), 3)
+
+    def test_selection_uses_member_position_bits(self):
+        # Bit 0 is Fruit.APPLE, bit 1 is Fruit.PEACH
+        self.assertEqual(self.get_changelist({'fruit__enum_mask': '2'}).queryset.count(), 1)
+        self.assertEqual(self.get_changelist({'fruit__enum_mask': '3'}).queryset.count(), 3)
+
+    def test_exclude(self):
+        changelist = self.get_changelist({'num__enum_mask': '2', 'num__enum_exclude': '1'})
+        self.assertEqual(changelist.queryset.count(), 2)
+
+    def test_filters_with_single_in_query(self):
+        changelist = self.get_changelist({'num__enum_mask': '6'})
+        self.assertIn(' IN (', str(changelist.queryset.query))
+
+    def test_ignores_invalid_masks(self):
+        self.assertEqual(self.get_changelist({'num__enum_mask': 'xyz'}).queryset.count(), 3)
+        self.assertEqual(self.get_changelist({'num__enum_mask': '-1'}).queryset.count(), 3)
+        self.assertEqual(self.get_changelist({'num__enum_mask': '8'}).queryset.count(), 3)
+
+    def test_choices_toggle_selection(self):
+        changelist = self.get_changelist({'num__enum_mask': '2'})
+        choices = list(changelist.filter_specs[0].choices(changelist))
+        self.assertEqual([choice['selected'] for choice in choices], [False, True, False, False])
+        self.assertEqual(choices[1]['query_string'], '?')
+        self.assertEqual(choices[2]['query_string'], '?num__enum_mask=6')
+        self.assertEqual(choices[3]['query_string'], '?num__enum_exclude=1&num__enum_mask=2')
+
+
+class CountingMultipleListFilterTests(ListFilterTestCase):
+    list_filter = (('num', CountingMultipleFilter), ('fruit', RichEnumFieldListFilter))
+
+    def setUp(self):
+        super(CountingMultipleListFilterTests, self).setUp()
+        NumNode.objects.create(num=Number.ONE, fruit=Fruit.PEACH)
+
+    def test_counts_ignore_own_selection(self):
+        expected = ['All', 'uno (1)', 'dos (2)', 'Exclude selected']
+        self.assertEqual(self.get_choices()[0], expected)
+        self.assertEqual(self.get_choices({'num__enum_mask': '2'})[0], expected)
+        self.assertEqual(self.get_choices({'num__enum_mask': '2', 'num__enum_exclude': '1'})[0], expected)
+
+    def test_counts_follow_other_filters(self):
+        choices = self.get_choices({'num__enum_mask': '2', 'fruit': 'apple'})
+        self.assertEqual(choices[0], ['All', 'uno (0)', 'dos (2)', 'Exclude selected'])
+
+
+class EnumOrderingTests(ListFilterTestCase):
+    admin_attrs = {'list_display': ('num', 'num_str', 'fruit'), 'enum_ordering': 'display'}
+
+    def setUp(self):
+        super(EnumOrderingTests, self).setUp()
+        NumNode.objects.create(num=Number.ONE)
+
+    def test_sorts_by_display_name(self):
+        # 'dos' sorts before 'uno'
+        changelist = self.get_changelist({'o': '1'})
+        self.assertEqual([node.num for node in changelist.queryset], [Number.TWO, Number.TWO, Number.ONE])
+        self.assertIn('CASE', str(changelist.queryset.query))
+
+    def test_default_sorts_by_stored_value(self):
+        self.model_admin.enum_ordering = None
+        changelist = self.get_changelist({'o': '1'})
+        self.assertEqual([node.num for node in changelist.queryset], [Number.ONE, Number.TWO, Number.TWO])
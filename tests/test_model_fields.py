@@ -1,7 +1,13 @@
 from django.db import IntegrityError
 from django.test import TestCase
+from richenum import OrderedRichEnum
+from richenum import OrderedRichEnumValue
 
-from .constants import Number
+from django_richenum.models import CanonicalNameEnumField
+from django_richenum.models import IndexEnumField
+from django_richenum.models import SmallIndexEnumField
+
+from .constants import Fruit, Number
 from .models import NumNode
 
 
@@ -136,3 +142,94 @@ class CanonicalNameFieldTests(TestCase):
         null_instance = NumNode(num_str=Number.ONE, num_str_nullable=None)
         null_instance.save()
         self.assertIsNone(null_instance.num_str_nullable)
+
+
+class LazyFieldTests(TestCase):
+    def test_assignment_stores_raw_value(self):
+        instance = NumNode(num_lazy=2, num_str_lazy='two')
+        self.assertEqual(instance.__dict__['num_lazy'], 2)
+        self.assertEqual(instance.__dict__['num_str_lazy'], 'two')
+
+    def test_access_converts_and_caches(self):
+        instance = NumNode(num_lazy=2, num_str_lazy='two')
+        self.assertEqual(instance.num_lazy, Number.TWO)
+        self.assertEqual(instance.num_str_lazy, Number.TWO)
+        self.assertIs(instance.__dict__['num_lazy'], Number.TWO)
+        self.assertIs(instance.__dict__['num_str_lazy'], Number.TWO)
+
+    def test_saves_raw_value(self):
+        instance = NumNode(num_lazy=2, num_str_lazy='two')
+        instance.save()
+        self.assertEqual(instance.__dict__['num_lazy'], 2)
+        self.assertEqual(NumNode.objects.filter(num_lazy=Number.TWO, num_str_lazy=Number.TWO).count(), 1)
+
+    def test_saves_enum_values(self):
+        NumNode.objects.create(num_lazy=Number.TWO, num_str_lazy=Number.TWO)
+        fetched = NumNode.objects.get()
+        self.assertEqual(fetched.num_lazy, Number.TWO)
+        self.assertEqual(fetched.num_str_lazy, Number.TWO)
+
+    def test_loads_raw_value(self):
+        NumNode.objects.create(num_lazy=Number.TWO, num_str_lazy=Number.TWO)
+        fetched = NumNode.objects.get()
+        self.assertEqual(fetched.__dict__['num_lazy'], 2)
+        self.assertEqual(fetched.__dict__['num_str_lazy'], 'two')
+        self.assertIs(fetched.num_lazy, Number.TWO)
+
+    def test_values_are_stored_values(self):
+        NumNode.objects.create(num_lazy=Number.TWO, num_str_lazy=Number.TWO)
+        self.assertEqual(list(NumNode.objects.values_list('num_lazy', 'num_str_lazy')), [(2, 'two')])
+
+    def test_deconstruct(self):
+        _, _, _, kwargs = IndexEnumField(Number, lazy=True).deconstruct()
+        self.assertTrue(kwargs['lazy'])
+        _, _, _, kwargs = IndexEnumField(Number).deconstruct()
+        self.assertNotIn('lazy', kwargs)
+
+
+class _Huge(OrderedRichEnumValue):
+    pass
+
+
+class Huge(OrderedRichEnum):
+    SMALL = _Huge(1, 'small', 'Small')
+    HUGE = _Huge(40000, 'huge', 'Huge')
+
+
+def check_field(field):
+    field.set_attributes_from_name('field')
+    return field.check()
+
+
+class SmallIndexFieldTests(TestCase):
+    def test_round_trip(self):
+        NumNode.objects.create(num_small=Number.TWO)
+        self.assertEqual(NumNode.objects.get().num_small, Number.TWO)
+        self.assertEqual(NumNode.objects.filter(num_small=2).count(), 1)
+
+    def test_internal_type(self):
+        self.assertEqual(SmallIndexEnumField(Number).get_internal_type(), 'PositiveSmallIntegerField')
+
+    def test_check_index_range(self):
+        self.assertEqual(NumNode._meta.get_field('num_small').check(), [])  # pylint: disable=E1101
+        errors = check_field(SmallIndexEnumField(Huge))
+        self.assertEqual([error.id for error in errors], ['django_richenum.E002'])
+        self.assertIn('huge', errors[0].msg)
+
+
+class CanonicalNameMaxLengthTests(TestCase):
+    def test_derives_max_length_from_longest_canonical_name(self):
+        self.assertEqual(CanonicalNameEnumField(Fruit).max_length, 5)
+        self.assertEqual(CanonicalNameEnumField(Huge).max_length, 5)
+
+    def test_explicit_max_length(self):
+        self.assertEqual(CanonicalNameEnumField(Fruit, max_length=20).max_length, 20)
+
+    def test_round_trip(self):
+        NumNode.objects.create(fruit_auto=Fruit.PEACH)
+        self.assertEqual(NumNode.objects.get().fruit_auto, Fruit.PEACH)
+
+    def test_check_max_length(self):
+        self.assertEqual(check_field(CanonicalNameEnumField(Huge)), [])
+        errors = check_field(CanonicalNameEnumField(Huge, max_length=4))
+        self.assertEqual([error.id for error in errors], ['django_richenum.E003'])
@@ -1,6 +1,9 @@
 from django import forms
 from unittest import TestCase
 
+from django_richenum.forms import MultipleIndexEnumField
+
+from .constants import Fruit, Number
 from .models import NumNode
 
 
@@ -24,3 +27,70 @@ class ModelFormTests(TestCase):
         }
         form = NumNodeModelForm(form_data)
         self.assertTrue(form.is_valid(), form.errors)
+
+
+class EnumSetModelForm(forms.ModelForm):
+
+    class Meta:
+        model = NumNode
+        fields = ("nums", )
+
+
+class EnumSetModelFormTests(TestCase):
+
+    def test_formfield(self):
+        form = EnumSetModelForm()
+        self.assertIsInstance(form.fields["nums"], MultipleIndexEnumField)
+        self.assertFalse(form.fields["nums"].required)
+
+    def test_model_form(self):
+        form = EnumSetModelForm({"nums": ["1", "2"]})
+        self.assertTrue(form.is_valid(), form.errors)
+        instance = form.save(commit=False)
+        self.assertEqual(instance.nums, frozenset([Number.ONE, Number.TWO]))
+
+    def test_renders_initial_selection(self):
+        form = EnumSetModelForm(instance=NumNode(nums=[Number.TWO]))
+        html = str(form["nums"])
+        self.assertIn('<option value="2" selected>', html)
+        self.assertIn('<option value="1">', html)
+
+
+class MultipleCanonicalNameModelForm(forms.ModelForm):
+
+    class Meta:
+        model = NumNode
+        fields = ("fruits", )
+
+
+class MultipleCanonicalNameModelFormTests(TestCase):
+
+    def test_renders_initial_selection(self):
+        form = MultipleCanonicalNameModelForm(instance=NumNode(fruits=[Fruit.PEACH]))
+        html = str(form["fruits"])
+        self.assertIn('<option value="peach" selected>', html)
+        self.assertIn('<option value="apple">', html)
+
+    def test_unchanged_form_keeps_value(self):
+        instance = NumNode(fruits=[Fruit.PEACH])
+        # The callable default makes the form render (and post) the initial value.
+        html = MultipleCanonicalNameModelForm(instance=instance)["fruits"].as_hidden(only_initial=True)
+        self.assertIn('value="peach"', html)
+        form = MultipleCanonicalNameModelForm({"fruits": ["peach"], "initial-fruits": ["peach"]}, instance=instance)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertFalse(form.has_changed())
+        self.assertEqual(form.save(commit=False).fruits, (Fruit.PEACH, ))
+
+    def test_has_changed_compares_canonical_names(self):
+        field = MultipleCanonicalNameModelForm().fields["fruits"]
+        self.assertFalse(field.has_changed((Fruit.PEACH, ), ["peach"]))
+        self.assertTrue(field.has_changed((Fruit.PEACH, ), ["apple"]))
+
+
+class SharedChoicesModelFormTests(TestCase):
+
+    def test_model_formfields_share_choices(self):
+        forms_ = [NumNodeModelForm() for _ in range(3)]
+        self.assertEqual(len(set(id(form.fields['num'].choices) for form in forms_)), 1)
+        self.assertIs(forms_[0].fields['num'].choices, forms_[0].fields['num_lax'].choices)
+        self.assertIs(forms_[0].fields['num_str'].choices, forms_[0].fields['num_str_nullable'].choices)
@@ -0,0 +1,89 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db.models import F
+from django.test import TestCase
+from richenum import EnumLookupError
+
+from django_richenum.forms.fields import MultipleCanonicalEnumField
+from django_richenum.forms.widgets import EnumSelectMultiple
+from django_richenum.models import MultipleCanonicalNameEnumField
+
+from .constants import Fruit, Number
+from .models import NumNode
+
+
+class MultipleCanonicalNameEnumFieldTests(TestCase):
+    def test_default(self):
+        self.assertEqual(NumNode().fruits, ())
+
+    def test_assignment_converts_to_sorted_tuple(self):
+        instance = NumNode()
+        instance.fruits = ['peach', Fruit.APPLE, Fruit.PEACH]
+        self.assertEqual(instance.fruits, (Fruit.APPLE, Fruit.PEACH))
+        instance.fruits = Fruit.PEACH
+        self.assertEqual(instance.fruits, (Fruit.PEACH,))
+
+    def test_stores_sorted_canonical_names(self):
+        NumNode.objects.create(fruits=[Fruit.PEACH, Fruit.APPLE])
+        self.assertEqual(list(NumNode.objects.values_list('fruits', flat=True)), [(Fruit.APPLE, Fruit.PEACH)])
+        self.assertEqual(NumNode.objects.get().fruits, (Fruit.APPLE, Fruit.PEACH))
+        self.assertEqual(NumNode.objects.filter(fruits=[Fruit.APPLE, Fruit.PEACH]).count(), 1)
+
+    def test_unknown_values(self):
+        with self.assertRaises(EnumLookupError):
+            NumNode(fruits=['pear'])
+
+    def test_rejects_other_types(self):
+        with self.assertRaises(TypeError):
+            NumNode(fruits='apple')
+        with self.assertRaises(TypeError):
+            NumNode(fruits=[1])
+
+    def test_contains_enum(self):
+        NumNode.objects.create(fruits=[Fruit.APPLE])
+        NumNode.objects.create(fruits=[Fruit.APPLE, Fruit.PEACH])
+        NumNode.objects.create()
+        self.assertEqual(NumNode.objects.filter(fruits__contains_enum=Fruit.APPLE).count(), 2)
+        self.assertEqual(NumNode.objects.filter(fruits__contains_enum=[Fruit.APPLE, Fruit.PEACH]).count(), 1)
+        with self.assertRaises(ValueError):
+            NumNode.objects.filter(fruits__contains_enum=[])
+
+    def test_overlaps(self):
+        NumNode.objects.create(fruits=[Fruit.APPLE])
+        NumNode.objects.create(fruits=[Fruit.PEACH])
+        NumNode.objects.create()
+        self.assertEqual(NumNode.objects.filter(fruits__overlaps=Fruit.PEACH).count(), 1)
+        self.assertEqual(NumNode.objects.filter(fruits__overlaps=['apple', Fruit.PEACH]).count(), 2)
+        self.assertEqual(NumNode.objects.filter(fruits__overlaps=[]).count(), 0)
+        self.assertEqual(NumNode.objects.exclude(fruits__overlaps=Fruit.PEACH).count(), 2)
+
+    def test_lookups_reject_expressions(self):
+        with self.assertRaises(TypeError):
+            NumNode.objects.filter(fruits__overlaps=F('fruits'))
+
+    def test_requires_canonical_name_lookup(self):
+        class NoCanonical(object):
+            pass
+        with self.assertRaises(TypeError):
+            MultipleCanonicalNameEnumField(NoCanonical)
+
+    def test_validate_blank(self):
+        NumNode(fruits=()).clean_fields(exclude=['parent'])
+        field = MultipleCanonicalNameEnumField(Fruit)
+        field.validate((Fruit.APPLE,), None)
+        with self.assertRaises(ValidationError):
+            field.validate((), None)
+
+    def test_deconstruct(self):
+        _, path, args, _ = MultipleCanonicalNameEnumField(Number).deconstruct()
+        self.assertEqual(path, 'django_richenum.models.fields.MultipleCanonicalNameEnumField')
+        self.assertEqual(args, [Number])
+
+    def test_formfield(self):
+        formfield = MultipleCanonicalNameEnumField(Fruit).formfield()
+        self.assertIsInstance(formfield, MultipleCanonicalEnumField)
+        self.assertEqual(formfield.clean(['apple']), [Fruit.APPLE])
+
+    def test_formfield_ignores_non_choice_widget(self):
+        formfield = MultipleCanonicalNameEnumField(Fruit).formfield(widget=forms.Textarea)
+        self.assertIsInstance(formfield.widget, EnumSelectMultiple)
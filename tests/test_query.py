@@ -0,0 +1,172 @@
+from unittest import skipUnless
+
+from django.test import TestCase
+
+from .constants import Fruit, Number
+from .models import NumNode
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class EnumRawTests(TestCase):
+    def setUp(self):
+        first = NumNode.objects.create(num=Number.ONE, num_lax=Number.TWO, num_str=Number.TWO)
+        NumNode.objects.create(num=Number.TWO, num_str=Number.ONE, parent=first)
+
+    def test_values_list_converts_by_default(self):
+        nums = NumNode.objects.order_by('num').values_list('num', flat=True)
+        self.assertEqual(list(nums), [Number.ONE, Number.TWO])
+
+    def test_values_list_raw(self):
+        qs = NumNode.objects.enum_raw().order_by('num')
+        self.assertEqual(list(qs.values_list('num', flat=True)), [1, 2])
+        self.assertEqual(list(qs.values_list('num_lax', flat=True)), [2, 1])
+        self.assertEqual(list(qs.values_list('num_str', flat=True)), ['two', 'one'])
+
+    def test_values_raw(self):
+        values = NumNode.objects.enum_raw().order_by('num').values('num', 'num_str')
+        self.assertEqual(list(values), [{'num': 1, 'num_str': 'two'}, {'num': 2, 'num_str': 'one'}])
+
+    def test_raw_single_field(self):
+        values = NumNode.objects.enum_raw('num').order_by('num').values_list('num', 'num_str')
+        self.assertEqual(list(values), [(1, Number.TWO), (2, Number.ONE)])
+
+    def test_raw_related_field(self):
+        nums = NumNode.objects.enum_raw().filter(parent__isnull=False).values_list('parent__num', flat=True)
+        self.assertEqual(list(nums), [1])
+
+    def test_raw_survives_chaining(self):
+        nums = NumNode.objects.enum_raw().filter(num=Number.TWO).values_list('num', flat=True)
+        self.assertEqual(list(nums), [2])
+
+    def test_model_instances_still_convert(self):
+        instance = NumNode.objects.enum_raw().get(num=Number.TWO)
+        self.assertEqual(instance.num, Number.TWO)
+        self.assertEqual(instance.num_lazy, Number.ONE)
+
+    def test_rejects_non_enum_fields(self):
+        with self.assertRaises(TypeError):
+            NumNode.objects.enum_raw('parent')
+
+
+class EnumArrayTests(TestCase):
+    def setUp(self):
+        NumNode.objects.create(num=Number.TWO, num_nullable=None)
+        NumNode.objects.create(num=Number.ONE, num_nullable=Number.TWO)
+
+    def test_enum_array(self):
+        column = NumNode.objects.order_by('pk').enum_array('num')
+        self.assertEqual(column.values.typecode, 'h')
+        self.assertEqual(list(column.values), [2, 1])
+        self.assertEqual([column.decode[i] for i in column.values], [Number.TWO, Number.ONE])
+
+    def test_decode_table(self):
+        column = NumNode.objects.enum_array('num')
+        self.assertEqual(column.decode, (None, Number.ONE, Number.TWO, None))
+
+    def test_nulls(self):
+        column = NumNode.objects.order_by('pk').enum_array('num_nullable')
+        self.assertEqual(list(column.values), [-1, 2])
+        self.assertEqual([column.decode[i] for i in column.values], [None, Number.TWO])
+
+    def test_null_value_picks_typecode(self):
+        column = NumNode.objects.order_by('pk').enum_array('num_nullable', null_value=65535)
+        self.assertEqual(column.values.typecode, 'i')
+        self.assertEqual(list(column.values), [65535, 2])
+        self.assertEqual(NumNode.objects.enum_array('num_nullable', null_value=-2 ** 40).values.typecode, 'q')
+
+    def test_rejects_null_value_out_of_range(self):
+        with self.assertRaises(ValueError):
+            NumNode.objects.enum_array('num_nullable', null_value=2 ** 64)
+
+    def test_small_chunks(self):
+        column = NumNode.objects.order_by('pk').enum_array('num', chunk_size=1)
+        self.assertEqual(list(column.values), [2, 1])
+
+    @skipUnless(numpy, 'numpy is not installed')
+    def test_numpy(self):
+        column = NumNode.objects.order_by('pk').enum_array('num', numpy=True)
+        self.assertEqual(column.values.tolist(), [2, 1])
+
+    def test_rejects_canonical_name_fields(self):
+        with self.assertRaises(TypeError):
+            NumNode.objects.enum_array('num_str')
+
+
+class EnumCountsTests(TestCase):
+    def setUp(self):
+        NumNode.objects.create(num=Number.TWO, num_str=Number.ONE, num_nullable=None)
+        NumNode.objects.create(num=Number.TWO, num_str=Number.TWO)
+        NumNode.objects.create(num=Number.TWO, num_str=Number.TWO)
+
+    def test_counts_include_empty_members(self):
+        counts = NumNode.objects.enum_counts('num')
+        self.assertEqual(list(counts.items()), [(Number.ONE, 0), (Number.TWO, 3)])
+
+    def test_counts_canonical_name_field(self):
+        counts = NumNode.objects.enum_counts('num_str')
+        self.assertEqual(counts, {Number.ONE: 1, Number.TWO: 2})
+
+    def test_counts_nulls(self):
+        counts = NumNode.objects.enum_counts('num_nullable')
+        self.assertEqual(counts, {Number.ONE: 2, Number.TWO: 0, None: 1})
+
+    def test_counts_filtered_queryset(self):
+        counts = NumNode.objects.filter(num_str=Number.TWO).enum_counts('num_str')
+        self.assertEqual(counts, {Number.ONE: 0, Number.TWO: 2})
+
+    def test_cross_tab(self):
+        with self.assertNumQueries(1):
+            counts = NumNode.objects.enum_counts('num', 'num_str')
+        self.assertEqual(counts, {
+            (Number.ONE, Number.ONE): 0,
+            (Number.ONE, Number.TWO): 0,
+            (Number.TWO, Number.ONE): 1,
+            (Number.TWO, Number.TWO): 2,
+        })
+
+    def test_requires_enum_fields(self):
+        with self.assertRaises(TypeError):
+            NumNode.objects.enum_counts()
+        with self.assertRaises(TypeError):
+            NumNode.objects.enum_counts('parent')
+
+
+class EnumValuesTests(TestCase):
+    def setUp(self):
+        first = NumNode.objects.create(num=Number.ONE, num_str=Number.TWO, fruit=Fruit.PEACH)
+        NumNode.objects.create(num=Number.TWO, num_nullable=None, parent=first)
+
+    def test_canonical_names(self):
+        values = NumNode.objects.order_by('pk').enum_values('num', 'num_str', 'fruit', 'num_nullable')
+        self.assertEqual(list(values), [
+            {'num': 'one', 'num_str': 'two', 'fruit': 'peach', 'num_nullable': 'one'},
+            {'num': 'two', 'num_str': 'one', 'fruit': 'apple', 'num_nullable': None},
+        ])
+
+    def test_index_and_display_name(self):
+        qs = NumNode.objects.order_by('pk')
+        self.assertEqual(list(qs.enum_values('num', 'num_str', enum_format='index')),
+                         [{'num': 1, 'num_str': 2}, {'num': 2, 'num_str': 1}])
+        self.assertEqual(list(qs.enum_values('num', 'fruit', enum_format='display_name')),
+                         [{'num': 'uno', 'fruit': 'melocoton'}, {'num': 'dos', 'fruit': 'manzana'}])
+        with self.assertRaises(TypeError):
+            qs.enum_values('fruit', enum_format='index')
+        with self.assertRaises(ValueError):
+            qs.enum_values('num', enum_format='label')
+
+    def test_all_fields(self):
+        row = NumNode.objects.order_by('pk').enum_values()[0]
+        self.assertEqual(row['num_lazy'], 'one')
+        self.assertEqual(row['parent_id'], None)
+
+    def test_related_fields(self):
+        row = NumNode.objects.filter(parent__isnull=False).enum_values('num', 'parent__num', 'parent__fruit').get()
+        self.assertEqual(row, {'num': 'two', 'parent__num': 'one', 'parent__fruit': 'peach'})
+
+    def test_chains(self):
+        values = NumNode.objects.enum_values('num').filter(num=Number.TWO)
+        self.assertEqual(list(values), [{'num': 'two'}])
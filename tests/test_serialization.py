@@ -0,0 +1,54 @@
+from django.core import serializers
+from django.test import TestCase
+
+from .constants import Fruit, Number
+from .models import NumNode
+
+
+class SerializationTests(TestCase):
+    def setUp(self):
+        self.node = NumNode.objects.create(
+            num=Number.TWO, num_nullable=None, num_lax=Number.TWO, num_str=Number.TWO, fruit=Fruit.PEACH,
+            nums=[Number.ONE, Number.TWO], fruits=[Fruit.PEACH, Fruit.APPLE])
+
+    def round_trip(self, format, **kwargs):
+        data = serializers.serialize(format, NumNode.objects.all(), **kwargs)
+        NumNode.objects.all().delete()
+        for deserialized in serializers.deserialize(format, data):
+            deserialized.save()
+        return data, NumNode.objects.get()
+
+    def assert_round_trip(self, node):
+        self.assertEqual(node.num, Number.TWO)
+        self.assertIsNone(node.num_nullable)
+        self.assertEqual(node.num_lax, Number.TWO)
+        self.assertEqual(node.num_str, Number.TWO)
+        self.assertEqual(node.fruit, Fruit.PEACH)
+        self.assertEqual(node.nums, frozenset([Number.ONE, Number.TWO]))
+
+    def test_serializes_stored_values(self):
+        fields = serializers.serialize('python', [self.node])[0]['fields']
+        self.assertEqual(fields['num'], '2')
+        self.assertIsNone(fields['num_nullable'])
+        self.assertEqual(fields['num_str'], 'two')
+        self.assertEqual(fields['fruit'], 'peach')
+        self.assertEqual(fields['nums'], '6')
+        self.assertEqual(fields['fruits'], ['apple', 'peach'])
+
+    def test_json_round_trip(self):
+        _, node = self.round_trip('json')
+        self.assert_round_trip(node)
+        self.assertEqual(node.fruits, (Fruit.APPLE, Fruit.PEACH))
+
+    def test_xml_round_trip(self):
+        data, node = self.round_trip('xml', fields=['num', 'num_nullable', 'num_lax', 'num_str', 'fruit', 'nums'])
+        self.assertIn('<field name="num" type="IntegerField">2</field>', data)
+        self.assert_round_trip(node)
+
+    def test_loads_indices_as_strings(self):
+        self.assertEqual(NumNode(num='2').num, Number.TWO)
+        self.assertEqual(NumNode(num_lax='2').num_lax, Number.TWO)
+        self.assertEqual(NumNode(num_lax='two').num_lax, Number.TWO)
+        self.assertEqual(NumNode(nums='6').nums, frozenset([Number.ONE, Number.TWO]))
+        with self.assertRaises(TypeError):
+            NumNode(num='two')
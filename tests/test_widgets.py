@@ -0,0 +1,116 @@
+from unittest import mock
+
+from django import forms
+from django.forms.renderers import DjangoTemplates
+from django.test import SimpleTestCase
+from django.utils import translation
+
+from django_richenum.forms import CanonicalEnumField
+from django_richenum.forms import EnumSelect
+from django_richenum.forms import EnumSelectMultiple
+from django_richenum.forms import IndexEnumField
+from django_richenum.forms import MultipleIndexEnumField
+
+from .constants import Fruit, Number
+
+
+class WrappingRenderer(DjangoTemplates):
+    # Stands in for a project overriding the select template.
+    def render(self, template_name, context, request=None):
+        html = super(WrappingRenderer, self).render(template_name, context, request)
+        if template_name == EnumSelect.template_name:
+            html = '<div class="wrapped">%s</div>' % html
+        return html
+
+
+class ExtraAttrsSelect(EnumSelect):
+    def get_context(self, name, value, attrs):
+        context = super(ExtraAttrsSelect, self).get_context(name, value, attrs)
+        context['widget']['attrs']['data-extra'] = 'yes'
+        return context
+
+
+class DataAttrSelect(EnumSelect):
+    def create_option(self, *args, **kwargs):
+        option = super(DataAttrSelect, self).create_option(*args, **kwargs)
+        option['attrs']['data-x'] = '1'
+        return option
+
+
+class EnumSelectTests(SimpleTestCase):
+
+    def assert_renders_like(self, widget, plain_widget, value, attrs=None):
+        self.assertHTMLEqual(widget.render('field', value, attrs), plain_widget.render('field', value, attrs))
+
+    def test_is_default_widget(self):
+        self.assertIsInstance(IndexEnumField(Number).widget, EnumSelect)
+        self.assertIsInstance(CanonicalEnumField(Fruit).widget, EnumSelect)
+        self.assertIsInstance(MultipleIndexEnumField(Number).widget, EnumSelectMultiple)
+
+    def test_renders_like_select(self):
+        field = IndexEnumField(Number)
+        plain = forms.Select(choices=field.choices)
+        for value in (None, 1, 2, '2', 3):
+            self.assert_renders_like(field.widget, plain, value, {'id': 'id_field', 'required': True})
+
+    def test_renders_like_select_multiple(self):
+        field = MultipleIndexEnumField(Number)
+        plain = forms.SelectMultiple(choices=field.choices)
+        for value in (None, [], [1], [1, 2]):
+            self.assert_renders_like(field.widget, plain, value)
+
+    def test_selects_first_match_only(self):
+        widget = EnumSelect()
+        widget.choices = (('a', 'A'), ('a', 'Also A'))
+        self.assertHTMLEqual(widget.render('field', 'a'), forms.Select(choices=widget.choices).render('field', 'a'))
+
+    def test_reuses_rendered_options(self):
+        widget = CanonicalEnumField(Fruit).widget
+        widget.render('field', None)
+        with mock.patch.object(EnumSelect, '_render_option', autospec=True,
+                               side_effect=EnumSelect._render_option) as render_option:
+            html = widget.render('field', 'peach')
+            # Only the selected option is rendered again.
+            self.assertEqual(render_option.call_count, 1)
+        self.assertInHTML('<option value="peach" selected>melocoton</option>', html)
+        self.assertInHTML('<option value="apple">manzana</option>', html)
+
+    def test_cached_per_language(self):
+        widget = CanonicalEnumField(Fruit).widget
+        widget.render('field', None)
+        with translation.override('fr'):
+            with mock.patch.object(EnumSelect, '_render_option', autospec=True,
+                                   side_effect=EnumSelect._render_option) as render_option:
+                widget.render('field', None)
+                self.assertEqual(render_option.call_count, 2)
+
+    def test_falls_back_for_lists_and_groups(self):
+        for choices in ([('a', 'A')], (('group', (('a', 'A'),)),)):
+            widget = EnumSelect()
+            widget.choices = choices
+            with mock.patch.object(EnumSelect, '_render_option') as render_option:
+                self.assert_renders_like(widget, forms.Select(choices=choices), 'a')
+            self.assertFalse(render_option.called)
+
+    def test_renders_select_template(self):
+        widget = CanonicalEnumField(Fruit).widget
+        renderer = WrappingRenderer()
+        widget.render('field', None, renderer=renderer)
+        html = widget.render('field', 'peach', renderer=renderer)
+        self.assertHTMLEqual(html, forms.Select(choices=widget.choices).render('field', 'peach', renderer=renderer))
+        self.assertTrue(html.startswith('<div class="wrapped"><select name="field">'))
+
+    def test_uses_get_context(self):
+        widget = ExtraAttrsSelect()
+        widget.choices = CanonicalEnumField(Fruit).choices
+        html = widget.render('field', 'apple')
+        self.assertInHTML('<option value="apple" selected>manzana</option>', html)
+        self.assertIn('data-extra="yes"', html)
+
+    def test_subclasses_have_own_cache(self):
+        IndexEnumField(Number).widget.render('field', None)
+        widget = DataAttrSelect()
+        widget.choices = IndexEnumField(Number).choices
+        html = widget.render('field', 2)
+        self.assertInHTML('<option value="1" data-x="1">uno</option>', html)
+        self.assertInHTML('<option value="2" data-x="1" selected>dos</option>', html)
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from django.urls import path
+
+from django_richenum.admin import RichEnumModelAdmin
+
+from .models import NumNode
+
+
+class NumNodeAdmin(RichEnumModelAdmin):
+    enum_autocomplete_fields = ('num', 'fruit')
+
+
+site = admin.AdminSite(name='enum_admin')
+site.register(NumNode, NumNodeAdmin)
+
+urlpatterns = [
+    path('admin/', site.urls),
+]